@@ -36,7 +36,7 @@ __version__ = '0.8.4'
 
 #__all__ = ['OERP', 'error']
 
-from oerplib.oerp import OERP
+from oerplib.oerp import OERP, AsyncOERP
 from oerplib import error
 
 # vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
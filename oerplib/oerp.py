@@ -26,9 +26,14 @@ import base64
 import zlib
 import tempfile
 import time
+import threading
+import weakref
+import collections
+import hashlib
+import Queue
 
 from oerplib import rpc, error, tools
-from oerplib.tools import session, v
+from oerplib.tools import session, executor, cache
 from oerplib.service import common, db, wizard, osv, inspect
 
 
@@ -39,28 +44,61 @@ class OERP(object):
     If no `database` is set, the `database` parameter of the
     :func:`login <oerplib.OERP.login>` method will be mandatory.
 
-    `XML-RPC` and `Net-RPC` protocols are supported. Respective values for the
-    `protocol` parameter are ``xmlrpc``, ``xmlrpc+ssl`` and ``netrpc``.
+    `XML-RPC`, `JSON-RPC` and `Net-RPC` protocols are supported. Respective
+    values for the `protocol` parameter are ``xmlrpc``, ``xmlrpc+ssl``,
+    ``jsonrpc``, ``jsonrpc+ssl`` and ``netrpc``.
 
         >>> import oerplib
         >>> oerp = oerplib.OERP('localhost', protocol='xmlrpc', port=8069)
 
+    .. versionadded:: 0.9
+
+        `JSON-RPC` support (servers in version `6.1` and above). Queries on
+        models are sent to the ``/web/dataset/call_kw`` controller, reports
+        and other services need a server in version `8.0` and above.
+
     Since the version `0.7`, `OERPLib` will try by default to detect the
     server version in order to adapt its requests. However, it is
     possible to force the version to use with the `version` parameter:
 
         >>> oerp = oerplib.OERP('localhost', version='6.0')
 
+    Since the version `0.9`, an instance can be shared between several
+    threads once logged in: each request checks out its own connection
+    (see the ``max_connections`` option of :attr:`config`).
+    Browsable records should not be shared between threads though.
+
+        >>> import threading
+        >>> oerp.login('admin', 'admin', 'db_name')
+        >>> def worker(ids):
+        ...     oerp.execute_kw('res.partner', 'write', [ids, {'active': True}])
+        >>> threads = [threading.Thread(target=worker, args=([i],)) for i in ids]
+
+    .. versionadded:: 0.9
+
+        The schema of the server (version and fields of models) can be
+        persisted on the disk with the `schema_cache` parameter, to let
+        short-lived processes (scripts, cron jobs...) start without fetching
+        it again. Set it to `True` to use the ``~/.cache/oerplib`` directory,
+        or give the path of another directory. The fields cached for a
+        database are discarded as soon as its list of installed modules
+        changes (see :class:`SchemaCache <oerplib.tools.cache.SchemaCache>`).
+        The version read from the cache is checked again by :func:`login`
+        (or when a `lazy` login fails), and detected
+        again if the server has been upgraded:
+
+        >>> oerp = oerplib.OERP('localhost', schema_cache=True)
+
     :raise: :class:`oerplib.error.InternalError`,
         :class:`oerplib.error.RPCError`
     """
 
     def __init__(self, server='localhost', database=None, protocol='xmlrpc',
-                 port=8069, timeout=120, version=None):
-        if protocol not in ['xmlrpc', 'xmlrpc+ssl', 'netrpc']:
+                 port=8069, timeout=120, version=None, schema_cache=None):
+        if protocol not in rpc.PROTOCOLS:
             txt = ("The protocol '{0}' is not supported by the OERP class. "
                    "Please choose a protocol among these ones: {1}")
-            txt = txt.format(protocol, ['xmlrpc', 'xmlrpc+ssl', 'netrpc'])
+            txt = txt.format(protocol, sorted(rpc.PROTOCOLS))
             raise error.InternalError(txt)
         self._server = server
         self._port = port
@@ -69,28 +107,95 @@ class OERP(object):
         self._uid = None
         self._password = None
         self._user = None
+        self._context = None
+        self._signature_checked = False
+        # Browse classes of models already fetched, shared by all 'get()' calls
+        self._models = {}
+        self._models_lock = threading.Lock()
+        # Units of work in progress (see 'session()'), per thread
+        self._uows = threading.local()
+        # Browsable records by model, ID and context (see 'identity_map')
+        self._identity_map = weakref.WeakValueDictionary()
         self._common = common.Common(self)
         self._db = db.DB(self)
         self._wizard = wizard.Wizard(self)
         self._inspect = inspect.Inspect(self)
-        # Instanciate the server connector
-        try:
-            self._connector = rpc.PROTOCOLS[protocol](
-                self._server, self._port, timeout, version)
-        except rpc.error.ConnectorError as exc:
-            raise error.InternalError(exc.message)
+        # Schema cache persisted on the disk
+        if schema_cache is True:
+            schema_cache = cache.SchemaCache()
+        elif isinstance(schema_cache, basestring):
+            schema_cache = cache.SchemaCache(schema_cache)
+        self._schema_cache = schema_cache or None
+        self._schema_key = '{0}://{1}:{2}'.format(protocol, server, port)
+        # Version read from the cache, checked again on the next login
+        self._version_cached = False
+        if self._schema_cache and not version:
+            version = self._schema_cache.get_version(self._schema_key)
+            self._version_cached = bool(version)
+        self._connector = self._get_connector(
+            timeout, version, store_version=not self._version_cached)
         # Dictionary of configuration options
         self._config = tools.Config(
             self,
             {'auto_context': True,
-             'timeout': timeout})
+             'timeout': timeout,
+             'prefetch_size': 500,
+             'write_refresh': 'all',
+             'deferred_types': ['binary', 'html'],
+             'pool_size': self._connector.pool.maxsize,
+             'pool_idle_timeout': self._connector.pool.idle_timeout,
+             'max_connections': self._connector.pool.maxconn,
+             'cache': None,
+             'identity_map': False})
+
+    def _get_connector(self, timeout, version=None, store_version=True):
+        """Instanciate the server connector (the version being detected if
+        not supplied), and store the version in the schema cache if
+        `store_version` is `True`.
+        """
+        try:
+            connector = rpc.PROTOCOLS[self._protocol](
+                self._server, self._port, timeout, version)
+        except rpc.error.ConnectorError as exc:
+            raise error.InternalError(exc.message)
+        if self._schema_cache and connector.version and store_version:
+            self._schema_cache.set_version(
+                self._schema_key, connector.version,
+                getattr(connector, '_url', None))
+        return connector
+
+    def _check_version(self):
+        """Check that the version read from the schema cache is still the
+        version of the server. If not (the server has been upgraded), the
+        connector is instanciated again to detect the new version.
+        """
+        if not self._version_cached:
+            return
+        self._version_cached = False
+        try:
+            version = self._connector.db.server_version()
+        except rpc.error.ConnectorError:
+            version = None
+        if version and version == self._connector.version:
+            self._schema_cache.set_version(
+                self._schema_key, version,
+                getattr(self._connector, '_url', None))
+            return
+        self._connector.pool.clear()
+        self._connector = self._get_connector(self._config['timeout'])
+        # Apply the configuration to the new connector
+        for key in ['pool_size', 'pool_idle_timeout', 'max_connections']:
+            self._config[key] = self._config[key]
 
     @property
     def config(self):
         """Dictionary of available configuration options.
 
         >>> oerp.config
-        {'auto_context': True, 'timeout': 120}
+        {'auto_context': True, 'timeout': 120, 'prefetch_size': 500,
+         'write_refresh': 'all', 'deferred_types': ['binary', 'html'],
+         'pool_size': 10, 'pool_idle_timeout': 60, 'max_connections': None,
+         'cache': None, 'identity_map': False}
 
         - ``auto_context``: if set to `True`, the user context will be sent
           automatically to every call of a
@@ -116,6 +221,93 @@ class OERP(object):
 
             >>> oerp.config['timeout'] = 300
 
+        - ``prefetch_size``: maximum number of records read in one RPC request
+          while iterating on browsable records (default: `500`):
+
+            .. versionadded:: 0.9
+
+            >>> oerp.config['prefetch_size'] = 1000
+            >>> for partner in oerp.browse('res.partner', partner_ids):
+            ...     print(partner.name)   # One 'read' per 1000 partners
+
+        - ``write_refresh``: how a record is updated once written with
+          :func:`write_record <oerplib.OERP.write_record>` (default:
+          ``'all'``). With ``'all'``, all its fields are read again from the
+          server. With ``'written'``, only the fields written are read again
+          (relational ones being fetched on their next access). With
+          ``'none'``, values written are applied locally without sending any
+          other request (values computed by the server are not updated):
+
+            .. versionadded:: 0.9
+
+            >>> oerp.config['write_refresh'] = 'none'
+            >>> partner.name = "Test"
+            >>> oerp.write_record(partner)  # 'write' only
+
+        - ``deferred_types``: types of fields not read with the other fields
+          of browsable records, but fetched on their first access for all
+          the records browsed at the same time (default:
+          ``['binary', 'html']``). The special ``'computed'`` type stands for
+          computed fields not stored in the database:
+
+            .. versionadded:: 0.9
+
+            >>> oerp.config['deferred_types'] = ['binary', 'html', 'computed']
+            >>> for product in oerp.browse('product.product', product_ids):
+            ...     print(product.name)     # Images are not downloaded
+
+        - ``pool_size``: maximum number of idle persistent (keep-alive)
+          connections kept to be reused by the next requests (default: `10`).
+          Only the `XML-RPC` and `Net-RPC` protocols support persistent
+          connections:
+
+            .. versionadded:: 0.9
+
+            >>> oerp.config['pool_size'] = 4
+
+        - ``pool_idle_timeout``: close persistent connections unused since
+          more than this number of seconds (default: `60`):
+
+            .. versionadded:: 0.9
+
+            >>> oerp.config['pool_idle_timeout'] = 30
+
+        - ``max_connections``: maximum number of connections used at the
+          same time by threads sharing this instance, other threads wait for
+          a connection to be released (default: `None`, no limit):
+
+            .. versionadded:: 0.9
+
+            >>> oerp.config['max_connections'] = 16
+
+        - ``cache``: a :class:`ResultCache <oerplib.tools.cache.ResultCache>`
+          instance keeping in memory the results of idempotent methods
+          (``fields_get``, ``name_get``, ``name_search``...), discarded when
+          records of their model are created, updated or deleted by this
+          instance (default: `None`, no cache). `True` stands for a cache
+          with the default settings, `False` or `None` disable it:
+
+            .. versionadded:: 0.9
+
+            >>> oerp.config['cache'] = True
+            >>> oerp.get('res.partner').name_get([1])  # Sent to the server
+            [[1, u'Your Company']]
+            >>> oerp.get('res.partner').name_get([1])  # Read from the cache
+            [[1, u'Your Company']]
+
+        - ``identity_map``: if set to `True`, browsing a record already
+          browsed (with the same context) and still referenced returns the
+          same instance instead of reading it again, so that its values are
+          fetched once and shared (default: `False`). Changes made locally
+          on a record are then visible from all the places it is browsed:
+
+            .. versionadded:: 0.9
+
+            >>> oerp.config['identity_map'] = True
+            >>> partners = [line.order_id.partner_id for line in lines]
+            >>> partners[0] is partners[-1]  # Same partner, read only once
+            True
+
         """
         return self._config
 
@@ -127,7 +319,13 @@ class OERP(object):
         >>> oerp.login('admin', 'admin') == oerp.user
         True
 
+        .. versionadded:: 0.9
+
+            After a :func:`login` with the `lazy` option, the record is
+            browsed on the first access to this property.
         """
+        if self._user is None and self._uid:
+            self._user = self.browse('res.users', self._uid, self.context)
         return self._user
 
     @property
@@ -140,7 +338,22 @@ class OERP(object):
         {'lang': 'fr_FR', 'tz': False}
         >>> oerp.context['lang'] = 'en_US'
 
+        .. versionadded:: 0.9
+
+            After a :func:`login` with the `lazy` option, the context is
+            fetched on the first access to this property (or read from the
+            schema cache if enabled).
         """
+        if self._context is None and self._uid:
+            pending_key = self._get_models_key()
+            self._context = self._get_user_context()
+            # Models registered before the language was known are moved
+            # to the registry of the language of the user
+            with self._models_lock:
+                pending = self._models.pop(pending_key, {})
+                models = self._models.setdefault(self._get_models_key(), {})
+                for name, model in pending.iteritems():
+                    models.setdefault(name, model)
         return self._context
 
     @property
@@ -152,6 +365,21 @@ class OERP(object):
         """
         return self._connector.version
 
+    @property
+    def version_info(self):
+        """.. versionadded:: 0.9
+
+        The version of the server parsed as a
+        :class:`Version <oerplib.tools.Version>` instance, with the
+        capabilities of the server (used internally to adapt the requests).
+
+        >>> oerp.version_info
+        Version('7.0-20131014-231047')
+        >>> oerp.version_info.supports_kwargs
+        True
+        """
+        return self._connector.version_info
+
     server = property(lambda self: self._server,
                       doc="The server name.")
     port = property(lambda self: self._port,
@@ -192,7 +420,7 @@ class OERP(object):
         if not self._uid or not self._password:
             raise error.Error(u"User login required.")
 
-    def login(self, user='admin', passwd='admin', database=None):
+    def login(self, user='admin', passwd='admin', database=None, lazy=False):
         """Log in as the given `user` with the password `passwd` on the
         database `database` and return the corresponding user as a browsable
         record (from the ``res.users`` model).
@@ -202,28 +430,90 @@ class OERP(object):
         >>> user.name
         u'Administrator'
 
+        .. versionadded:: 0.9
+
+            If `lazy` is `True`, only the authentication request is sent and
+            the ID of the user is returned. The context of the user and its
+            browsable record are fetched on the first access to the
+            :attr:`context` and :attr:`user` properties (the context being
+            kept in the schema cache if enabled), and the signature of the
+            schema cache is checked when fields of a model are first needed.
+            Useful for short-lived scripts:
+
+            >>> oerp.login('admin', 'admin', 'db_name', lazy=True)
+            1
+            >>> oerp.config['auto_context'] = False
+            >>> oerp.get('res.partner').search([('customer', '=', True)])
+            [3, 5, 8]
+
+            With the ``auto_context`` option enabled (default), the first
+            call of a model method fetches the context to send it (one
+            ``context_get`` request, unless the context is in the schema
+            cache).
+
         :return: the user connected as a browsable record
+            (its ID if `lazy` is `True`)
         :raise: :class:`oerplib.error.RPCError`, :class:`oerplib.error.Error`
         """
         # Raise an error if no database was given
         self._database = database or self._database_default
         if not self._database:
             raise error.Error("No database specified")
+        # The version read from the schema cache may be outdated
+        if not lazy:
+            self._check_version()
         # Get the user's ID and generate the corresponding User record
         try:
             user_id = self.common.login(self._database, user, passwd)
-        except rpc.error.ConnectorError as exc:
-            raise error.RPCError(exc.message, exc.oerp_traceback)
+        except error.RPCError:
+            # Lazy login: the version read from the cache may be outdated
+            if not self._version_cached:
+                raise
+            self._check_version()
+            user_id = self.common.login(self._database, user, passwd)
+        if user_id:
+            self._uid = user_id
+            self._password = passwd
+            self._user = None
+            self._context = None
+            self._signature_checked = False
+            self._identity_map.clear()
+            if lazy:
+                return user_id
+            self._context = self.execute('res.users', 'context_get')
+            self._check_schema_signature()
+            self._user = self.browse('res.users', user_id, self._context)
+            return self._user
         else:
-            if user_id:
-                self._uid = user_id
-                self._password = passwd
-                self._context = self.execute('res.users', 'context_get')
-                self._user = self.browse('res.users', user_id, self._context)
-                return self._user
-            else:
-                #FIXME: Raise an error?
-                raise error.RPCError("Wrong login ID or password")
+            #FIXME: Raise an error?
+            raise error.RPCError("Wrong login ID or password")
+
+    def _get_user_context(self):
+        """Return the context of the user connected, read from the schema
+        cache if enabled.
+        """
+        if not self._schema_cache:
+            return self.execute('res.users', 'context_get')
+        context = self._schema_cache.get_context(
+            self._schema_key, self._database, self._uid)
+        if context is None:
+            context = self.execute('res.users', 'context_get')
+            self._schema_cache.set_context(
+                self._schema_key, self._database, self._uid, context)
+        return context
+
+    def _check_schema_signature(self):
+        """Bind the schema cache (if enabled) to the signature of the
+        current database, once per login.
+        """
+        if self._schema_cache and not self._signature_checked:
+            changed = self._schema_cache.check_signature(
+                self._schema_key, self._database,
+                self._get_schema_signature())
+            # Modules updated: the server may have been upgraded too
+            if changed:
+                self._check_version()
+        self._signature_checked = True
 
     # ------------------------- #
     # -- Raw XML-RPC methods -- #
@@ -240,14 +530,17 @@ class OERP(object):
         :raise: :class:`oerplib.error.RPCError`
         """
         self._check_logged_user()
-        # Execute the query
-        try:
-            return self._connector.object.execute(
-                self._database, self._uid,
-                self._password,
-                model, method, *args)
-        except rpc.error.ConnectorError as exc:
-            raise error.RPCError(exc.message, exc.oerp_traceback)
+
+        def call():
+            """Execute the query."""
+            try:
+                return self._connector.object.execute(
+                    self._database, self._uid,
+                    self._password,
+                    model, method, *args)
+            except rpc.error.ConnectorError as exc:
+                raise error.RPCError(exc.message, exc.oerp_traceback)
+        return self._call_with_cache(model, method, args, None, call)
 
     def execute_kw(self, model, method, args=None, kwargs=None):
         """Execute the `method` of `model`.
@@ -266,15 +559,123 @@ class OERP(object):
         :raise: :class:`oerplib.error.RPCError`
         """
         self._check_logged_user()
-        # Execute the query
         args = args or []
         kwargs = kwargs or {}
+
+        def call():
+            """Execute the query."""
+            try:
+                return self._connector.object.execute_kw(
+                    self._database, self._uid, self._password,
+                    model, method, args, kwargs)
+            except rpc.error.ConnectorError as exc:
+                raise error.RPCError(exc.message, exc.oerp_traceback)
+        return self._call_with_cache(model, method, args, kwargs, call)
+
+    def _call_with_cache(self, model, method, args, kwargs, call):
+        """Return the result of `call`, read from the result cache (see the
+        ``cache`` option) if the results of `method` are cached. Results
+        of `model` are discarded if `method` modifies its records.
+        """
+        cache = self._config['cache']
+        if cache is None:
+            return call()
+        if method in cache.invalidating_methods:
+            try:
+                return call()
+            finally:
+                cache.invalidate(model)
+        ttl = cache.get_ttl(model, method)
+        if not ttl:
+            return call()
+        key = cache.make_key(
+            self._database, self._uid, model, method, args, kwargs)
+        found, result = cache.get(key)
+        if not found:
+            result = call()
+            cache.set(key, result, ttl)
+        return result
+
+    def execute_many(self, calls, workers=8, ordered=True):
+        """.. versionadded:: 0.9
+
+        Execute several independent queries concurrently with a pool of
+        `workers` threads, and return a generator of their results.
+        `calls` is an iterable of ``(model, method, args, kwargs)`` tuples
+        (`args` and `kwargs` are optional, see :func:`execute_kw`).
+        An error raised by a query does not interrupt the others: the
+        exception is generated in place of its result.
+
+        >>> calls = [('res.partner', 'write', [[id_], {'active': True}])
+        ...          for id_ in partner_ids]
+        >>> list(oerp.execute_many(calls, workers=16))
+        [True, True, RPCError(...), True, ...]
+
+        If `ordered` is `True`, results are generated in the order of
+        `calls`. Otherwise, ``(index, result)`` tuples are generated as soon as
+        queries are done, `index` being the position of the query in `calls`:
+
+        >>> for index, result in oerp.execute_many(calls, ordered=False):
+        ...     print(index, result)
+
+        .. note::
+
+            On servers prior to the version `6.1`, `kwargs` are not supported
+            and queries are sent with the :func:`execute` method.
+
+        :return: a generator of results
+        :raise: :class:`oerplib.error.Error` (on call, if no user is logged)
+        """
+        self._check_logged_user()
+        return self._execute_many(calls, workers, ordered)
+
+    def _execute_many(self, calls, workers, ordered):
+        """Generator used by :func:`execute_many`."""
+        pool = executor.Executor(workers)
+        # Limit the number of pending queries to not consume all 'calls'
+        maxsize = workers * 2
+        pending = collections.deque()
+        done = Queue.Queue()
         try:
-            return self._connector.object.execute_kw(
-                self._database, self._uid, self._password,
-                model, method, args, kwargs)
-        except rpc.error.ConnectorError as exc:
-            raise error.RPCError(exc.message, exc.oerp_traceback)
+            for index, call in enumerate(calls):
+                future = pool.submit(self._execute_call, *call)
+                if ordered:
+                    pending.append(future)
+                    if len(pending) >= maxsize:
+                        yield pending.popleft().result()
+                else:
+                    pending.append(index)
+                    future.add_done_callback(
+                        lambda fut, index=index: done.put((index, fut)))
+                    if len(pending) >= maxsize:
+                        index, future = done.get()
+                        pending.pop()
+                        yield index, future.result()
+            while pending:
+                if ordered:
+                    yield pending.popleft().result()
+                else:
+                    index, future = done.get()
+                    pending.pop()
+                    yield index, future.result()
+        finally:
+            # Queries not started yet are canceled if the generator is closed
+            pool.shutdown(cancel=True)
+
+    def _execute_call(self, model, method, args=None, kwargs=None):
+        """Execute a query for :func:`execute_many`, and return the
+        exception raised instead of the result in case of error.
+        """
+        try:
+            if not self.version_info.supports_kwargs:
+                if kwargs:
+                    raise error.RPCError(
+                        "Named parameters are not supported by the version "
+                        "of this server.")
+                return self.execute(model, method, *(args or []))
+            return self.execute_kw(model, method, args, kwargs)
+        except Exception as exc:
+            return exc
 
     def exec_workflow(self, model, signal, obj_id):
         """Execute the workflow `signal` on
@@ -291,6 +692,9 @@ class OERP(object):
                 model, signal, obj_id)
         except rpc.error.ConnectorError as exc:
             raise error.RPCError(exc.message, exc.oerp_traceback)
+        finally:
+            if self._config['cache'] is not None:
+                self._config['cache'].invalidate(model)
 
     def report(self, report_name, model, obj_ids, report_type='pdf',
                context=None):
@@ -313,7 +717,7 @@ class OERP(object):
             context = self.context
         # Execute the report query
         try:
-            if v(self.version) < v('6.1'):
+            if not self.version_info.has_render_report:
                 pdf_data = self._get_report_data_v5(
                     report_name, model, obj_ids, report_type, context)
             else:
@@ -339,7 +743,7 @@ class OERP(object):
         }
         try:
             return self._connector.report.render_report(
-                self._database, self.user.id, self._password,
+                self._database, self._uid, self._password,
                 report_name, obj_ids, data, context)
         except rpc.error.ConnectorError as exc:
             raise error.RPCError(exc.message, exc.oerp_traceback)
@@ -357,7 +761,7 @@ class OERP(object):
         }
         try:
             report_id = self._connector.report.report(
-                self._database, self.user.id, self._password,
+                self._database, self._uid, self._password,
                 report_name, obj_ids, data, context)
         except rpc.error.ConnectorError as exc:
             raise error.RPCError(exc.message, exc.oerp_traceback)
@@ -366,7 +770,7 @@ class OERP(object):
         while not state:
             try:
                 pdf_data = self._connector.report.report_get(
-                    self._database, self.user.id, self._password,
+                    self._database, self._uid, self._password,
                     report_id)
             except rpc.error.ConnectorError as exc:
                 raise error.RPCError("Unknown error occurred during the "
@@ -405,7 +809,7 @@ class OERP(object):
     # -- High Level methods  -- #
     # ------------------------- #
 
-    def browse(self, model, ids, context=None):
+    def browse(self, model, ids, context=None, fields=None):
         """Browse one or several records (if `ids` is a list of IDs)
         from `model`. The fields and values for such objects are generated
         dynamically.
@@ -419,11 +823,18 @@ class OERP(object):
         A list of data types used by ``browse_record`` fields are
         available :ref:`here <fields>`.
 
+        .. versionadded:: 0.9
+
+            Only the `fields` listed are read with the records if specified,
+            other ones being fetched on their first access:
+
+            >>> partner = oerp.browse('res.partner', 1, fields=['name'])
+
         :return: a ``browse_record`` instance
         :return: a generator to iterate on ``browse_record`` instances
         :raise: :class:`oerplib.error.RPCError`
         """
-        return self.get(model).browse(ids, context)
+        return self.get(model).browse(ids, context, fields)
 
     def search(self, model, args=None, offset=0, limit=None, order=None,
                context=None, count=False):
@@ -439,7 +850,7 @@ class OERP(object):
         """
         if args is None:
             args = []
-        context = context or self._context
+        context = context or self.context
         return self.execute(model, 'search', args, offset, limit, order,
                             context, count)
 
@@ -452,7 +863,7 @@ class OERP(object):
         :return: the ID of the new record.
         :raise: :class:`oerplib.error.RPCError`
         """
-        context = context or self._context
+        context = context or self.context
         return self.execute(model, 'create', vals, context)
 
     def read(self, model, ids, fields=None, context=None):
@@ -467,7 +878,7 @@ class OERP(object):
         """
         if fields is None:
             fields = []
-        context = context or self._context
+        context = context or self.context
         return self.execute(model, 'read', ids, fields, context)
 
     def write(self, model, ids, vals=None, context=None):
@@ -484,7 +895,7 @@ class OERP(object):
         #    ids = []
         if vals is None:
             vals = {}
-        context = context or self._context
+        context = context or self.context
         return self.execute(model, 'write', ids, vals, context)
 
     def unlink(self, model, ids, context=None):
@@ -497,7 +908,7 @@ class OERP(object):
         """
         #if ids is None:
         #    ids = []
-        context = context or self._context
+        context = context or self.context
         return self.execute(model, 'unlink', ids, context)
 
     # ---------------------- #
@@ -519,8 +930,48 @@ class OERP(object):
         """
         if not isinstance(browse_record, osv.BrowseRecord):
             raise ValueError("An instance of BrowseRecord is required")
-        return osv.Model(self, browse_record.__osv__['name'])._write_record(
-            browse_record, context)
+        return browse_record.__osv__['model']._write_record(browse_record, context)
+
+    def session(self, refresh=False, context=None):
+        """.. versionadded:: 0.9
+
+        Return a unit of work to use with the ``with`` statement. Browsable
+        records updated inside the ``with`` block are written when leaving
+        it, with one ``write`` request per model and per set of identical
+        values, instead of a :func:`write_record` call per record.
+        Values written are applied locally, or read from the server with one
+        request per model if `refresh` is `True` (or ``'written'`` to read
+        only the fields written, see the ``write_refresh`` option of
+        :attr:`config`):
+
+        >>> with oerp.session() as session:
+        ...     for partner in oerp.browse('res.partner', partner_ids):
+        ...         partner.active = False
+        >>> session.requests, session.saved
+        (1, 199)
+
+        See :class:`UnitOfWork <oerplib.service.osv.UnitOfWork>`.
+
+        :return: a :class:`UnitOfWork <oerplib.service.osv.UnitOfWork>` instance
+        """
+        self._check_logged_user()
+        return osv.UnitOfWork(self, refresh, context)
+
+    def _uow_stack(self):
+        """Return the stack of units of work in progress in the
+        current thread.
+        """
+        if not hasattr(self._uows, 'stack'):
+            self._uows.stack = []
+        return self._uows.stack
+
+    def _track_record(self, record):
+        """Register the updated `record` in the unit of work in progress
+        in the current thread, if any.
+        """
+        stack = getattr(self._uows, 'stack', None)
+        if stack:
+            stack[-1].add(record)
 
     def unlink_record(self, browse_record, context=None):
         """.. versionadded:: 0.4
@@ -535,8 +986,7 @@ class OERP(object):
         """
         if not isinstance(browse_record, osv.BrowseRecord):
             raise ValueError("An instance of BrowseRecord is required")
-        return osv.Model(self, browse_record.__osv__['name'])._unlink_record(
-            browse_record, context)
+        return browse_record.__osv__['model']._unlink_record(browse_record, context)
 
     def refresh(self, browse_record, context=None):
         """Restore original values on `browse_record` with data
@@ -545,16 +995,14 @@ class OERP(object):
 
         :raise: :class:`oerplib.error.RPCError`
         """
-        return osv.Model(self, browse_record.__osv__['name'])._refresh(
-            browse_record, context)
+        return browse_record.__osv__['model']._refresh(browse_record, context)
 
     def reset(self, browse_record):
         """Cancel all changes made locally on the `browse_record`.
         No request to the server is executed to perform this operation.
         Therefore, values restored may be outdated.
         """
-        return osv.Model(self, browse_record.__osv__['name'])._reset(
-            browse_record)
+        return browse_record.__osv__['model']._reset(browse_record)
 
     @staticmethod
     def get_osv_name(browse_record):
@@ -579,9 +1027,104 @@ class OERP(object):
         Return a proxy of the `model` built from the
         server (see :class:`oerplib.service.osv.Model`).
 
+        Since the version `0.9`, proxies are kept in a registry bound to
+        the current database, user, language and server version, so the
+        fields of a model are fetched only once (see
+        :func:`clear_models <oerplib.OERP.clear_models>`):
+
+            >>> oerp.get('res.partner') is oerp.get('res.partner')
+            True
+
+        Fields of the model are fetched on the first browsed record only:
+        getting a proxy sends no request, and calling a method of the model
+        sends the corresponding request only (preceded by a ``context_get``
+        request the first time after a `lazy` login, when the
+        ``auto_context`` option is enabled).
+
         :return: an instance of :class:`oerplib.service.osv.Model`
         """
-        return osv.Model(self, model)
+        key = self._get_models_key()
+        models = self._models.get(key, {})
+        if model not in models:
+            with self._models_lock:
+                models = self._models.setdefault(key, {})
+                if model not in models:
+                    models[model] = osv.Model(self, model)
+        return models[model]
+
+    def clear_models(self, model=None):
+        """.. versionadded:: 0.9
+
+        Invalidate the registry of models used by the
+        :func:`get <oerplib.OERP.get>` method, so that their fields will be
+        fetched again from the server on the next call.
+        If `model` is not specified, all models are invalidated:
+
+            >>> oerp.clear_models('res.partner')
+            >>> oerp.clear_models()
+
+        Useful after the installation or the update of a module.
+        """
+        if self._schema_cache and self._database:
+            self._schema_cache.clear(self._schema_key, self._database, model)
+        if self._config['cache'] is not None:
+            self._config['cache'].invalidate(model)
+        with self._models_lock:
+            if model is None:
+                self._models.clear()
+                return
+            for models in self._models.itervalues():
+                models.pop(model, None)
+
+    def _get_models_key(self):
+        """Return the key identifying the registry of models to use
+        (models depend on the database, the user, its language and
+        the server version). The context is not fetched to get the language
+        after a lazy login: it is `None` until then.
+        """
+        if self._context is None:
+            lang = None
+        else:
+            lang = self._context.get('lang') or False
+        return (self._database, self._uid, lang, self.version)
+
+    def _get_fields(self, model):
+        """Return the fields of `model` (result of its ``fields_get``
+        method), read from the schema cache if enabled.
+        """
+        if not self._schema_cache:
+            return self.execute(model, 'fields_get')
+        self._check_schema_signature()
+        lang = self.context and self.context.get('lang') or False
+        fields = self._schema_cache.get_fields(
+            self._schema_key, self._database, lang, model)
+        if fields is None:
+            fields = self.execute(model, 'fields_get')
+            self._schema_cache.set_fields(
+                self._schema_key, self._database, lang, model, fields)
+        return fields
+
+    def _get_schema_signature(self):
+        """Return a signature of the schema of the current database,
+        computed from the name and the version of installed modules.
+        """
+        domain = [('state', '=', 'installed')]
+        fields = ['name', 'latest_version']
+        try:
+            if self.version_info.has_search_read:
+                modules = self.execute(
+                    'ir.module.module', 'search_read', domain, fields)
+            else:
+                ids = self.execute('ir.module.module', 'search', domain)
+                modules = self.execute('ir.module.module', 'read', ids, fields)
+        except error.RPCError:
+            # Modules not readable by the user, the schema is bound to
+            # the server version only
+            return self.version
+        modules = sorted(
+            (mod['name'], mod['latest_version'] or '') for mod in modules)
+        signature = hashlib.md5(repr(modules).encode('utf-8')).hexdigest()
+        return signature
 
     def save(self, name, rc_file='~/.oerplibrc'):
         """.. versionadded:: 0.8
@@ -677,4 +1220,129 @@ class OERP(object):
                     name, cls.__name__))
         return session.remove(name, rc_file)
 
+
+class AsyncOERP(object):
+    """.. versionadded:: 0.9
+
+    Asynchronous front-end of an :class:`OERP` instance.
+    It provides the same high-level methods, but they return immediately a
+    :class:`Future <oerplib.tools.executor.Future>` instance while requests
+    are sent to the server by a pool of `workers` threads
+    (see :class:`Executor <oerplib.tools.executor.Executor>`).
+    Errors are the same ones raised by the :class:`OERP` class, and are
+    raised when retrieving the result:
+
+        >>> import oerplib
+        >>> oerp = oerplib.OERP('localhost', protocol='xmlrpc', port=8069)
+        >>> oerp.login('admin', 'admin', 'db_name')
+        >>> aoerp = oerplib.AsyncOERP(oerp, workers=32)
+        >>> futures = [aoerp.read('res.partner', [id_], ['name'])
+        ...            for id_ in partner_ids]
+        >>> [future.result() for future in futures]
+        [[{'name': u'ASUStek', 'id': 2}], [{'name': u'Your Company', 'id': 1}], ...]
+
+    Other attributes (``login``, ``get``, ``context``, ``config``...) are
+    those of the `oerp` instance, and are synchronous.
+    The number of connections used at the same time can be limited with the
+    ``max_connections`` option of :attr:`OERP.config <oerplib.OERP.config>`.
+    """
+
+    def __init__(self, oerp, workers=8):
+        self._oerp = oerp
+        self._executor = executor.Executor(workers)
+
+    oerp = property(lambda self: self._oerp,
+                    doc="The :class:`OERP` instance used.")
+
+    def __getattr__(self, name):
+        return getattr(self._oerp, name)
+
+    def execute(self, model, method, *args):
+        """Asynchronous version of :func:`OERP.execute`.
+
+        :return: a :class:`Future <oerplib.tools.executor.Future>` instance
+        """
+        return self._executor.submit(self._oerp.execute, model, method, *args)
+
+    def execute_kw(self, model, method, args=None, kwargs=None):
+        """Asynchronous version of :func:`OERP.execute_kw`.
+
+        :return: a :class:`Future <oerplib.tools.executor.Future>` instance
+        """
+        return self._executor.submit(
+            self._oerp.execute_kw, model, method, args, kwargs)
+
+    def exec_workflow(self, model, signal, obj_id):
+        """Asynchronous version of :func:`OERP.exec_workflow`.
+
+        :return: a :class:`Future <oerplib.tools.executor.Future>` instance
+        """
+        return self._executor.submit(
+            self._oerp.exec_workflow, model, signal, obj_id)
+
+    def report(self, report_name, model, obj_ids, report_type='pdf',
+               context=None):
+        """Asynchronous version of :func:`OERP.report`.
+
+        :return: a :class:`Future <oerplib.tools.executor.Future>` instance
+        """
+        return self._executor.submit(
+            self._oerp.report, report_name, model, obj_ids, report_type,
+            context)
+
+    def browse(self, model, ids, context=None, fields=None):
+        """Asynchronous version of :func:`OERP.browse`.
+
+        :return: a :class:`Future <oerplib.tools.executor.Future>` instance
+        """
+        return self._executor.submit(
+            self._oerp.browse, model, ids, context, fields)
+
+    def search(self, model, args=None, offset=0, limit=None, order=None,
+               context=None, count=False):
+        """Asynchronous version of :func:`OERP.search`.
+
+        :return: a :class:`Future <oerplib.tools.executor.Future>` instance
+        """
+        return self._executor.submit(
+            self._oerp.search, model, args, offset, limit, order,
+            context, count)
+
+    def create(self, model, vals, context=None):
+        """Asynchronous version of :func:`OERP.create`.
+
+        :return: a :class:`Future <oerplib.tools.executor.Future>` instance
+        """
+        return self._executor.submit(self._oerp.create, model, vals, context)
+
+    def read(self, model, ids, fields=None, context=None):
+        """Asynchronous version of :func:`OERP.read`.
+
+        :return: a :class:`Future <oerplib.tools.executor.Future>` instance
+        """
+        return self._executor.submit(
+            self._oerp.read, model, ids, fields, context)
+
+    def write(self, model, ids, vals=None, context=None):
+        """Asynchronous version of :func:`OERP.write`.
+
+        :return: a :class:`Future <oerplib.tools.executor.Future>` instance
+        """
+        return self._executor.submit(
+            self._oerp.write, model, ids, vals, context)
+
+    def unlink(self, model, ids, context=None):
+        """Asynchronous version of :func:`OERP.unlink`.
+
+        :return: a :class:`Future <oerplib.tools.executor.Future>` instance
+        """
+        return self._executor.submit(self._oerp.unlink, model, ids, context)
+
+    def shutdown(self, wait=True):
+        """Stop the worker threads once pending requests are done
+        (see :func:`Executor.shutdown
+        <oerplib.tools.executor.Executor.shutdown>`).
+        """
+        self._executor.shutdown(wait)
+
 # vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
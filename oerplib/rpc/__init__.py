@@ -30,8 +30,8 @@ On the other hand, `JSON-RPC` provides a completely different interface, with
 services provided by Web modules like ``web/session``,
 ``web/dataset`` and so on.
 """
-from oerplib.rpc import error, service, jsonrpclib
-from oerplib.tools import v
+from oerplib.rpc import error, service, jsonrpclib, pool
+from oerplib.tools import Version
 
 # XML-RPC available URL
 # '/xmlrpc'             => 5.0, 6.0, 6.1, 7.0, 8.0 (legacy path)
@@ -43,8 +43,17 @@ XML_RPC_PATHS = ['/xmlrpc', '/openerp/xmlrpc/1', '/xmlrpc/2']
 class Connector(object):
     """Connector base class defining the interface used
     to interact with a server.
+
+    Persistent connections are kept in the :attr:`pool` attribute
+    (a :class:`ConnectionPool <oerplib.rpc.pool.ConnectionPool>` instance)
+    to be reused between requests when the protocol supports it.
+
+    The server version is parsed once in the :attr:`version_info` attribute
+    (a :class:`Version <oerplib.tools.Version>` instance) each time the
+    :attr:`version` attribute is set.
     """
     def __init__(self, server, port=8069, timeout=120, version=None):
+        self.pool = pool.ConnectionPool()
         self.server = server
         try:
             int(port)
@@ -58,6 +67,15 @@ class Connector(object):
         self.version = version
         self._url = None
 
+    @property
+    def version(self):
+        return self._version
+
+    @version.setter
+    def version(self, version):
+        self._version = version
+        self.version_info = version and Version(version) or None
+
     @property
     def timeout(self):
         return self._timeout
@@ -89,18 +107,9 @@ class ConnectorXMLRPC(Connector):
         super(ConnectorXMLRPC, self).__init__(server, port, timeout, version)
         self.scheme = scheme
         if self.version:
-            # Server < 6.1
-            if v(self.version) < v('6.1'):
-                self._url = '{scheme}://{server}:{port}/xmlrpc'.format(
-                    scheme=self.scheme, server=self.server, port=self.port)
-            # Server >= 6.1 and < 8.0
-            elif v(self.version) < v('8.0'):
-                self._url = '{scheme}://{server}:{port}/openerp/xmlrpc/1'.format(
-                    scheme=self.scheme, server=self.server, port=self.port)
-            # Server >= 8.0
-            elif v(self.version) >= v('8.0'):
-                self._url = '{scheme}://{server}:{port}/xmlrpc/2'.format(
-                    scheme=self.scheme, server=self.server, port=self.port)
+            self._url = '{scheme}://{server}:{port}{path}'.format(
+                scheme=self.scheme, server=self.server, port=self.port,
+                path=self.version_info.xmlrpc_path)
         # Detect the XML-RPC path to use
         if self._url is None:
             # We begin with the last known XML-RPC path to give the priority to
@@ -190,23 +199,36 @@ class ConnectorJSONRPC(Connector):
     >>> cnt.proxy['web']['dataset'].call(model='res.partner', method='read', args=[[1]])
     {u'jsonrpc': u'2.0', u'id': 102320639,
      u'result': [{u'id': 1, u'comment': False, u'ean13': False, u'property_account_position': False, ...}]}
+
+    Services of the `XML-RPC` interface are provided as well (see
+    :class:`ServiceJSONRPC <oerplib.rpc.service.ServiceJSONRPC>`), once
+    logged in:
+
+    >>> uid = cnt.common.login('database', 'admin', 'admin')
+    >>> res = cnt.object.execute('database', uid, 'admin', 'res.partner', 'read', [1])
     """
+    ssl = False
+
     def __init__(self, server, port=8069, timeout=120, version=None,
                  deserialize=True):
         super(ConnectorJSONRPC, self).__init__(server, port, timeout, version)
         self.deserialize = deserialize
-        self._proxy = self._get_proxy(ssl=False)
+        self._proxy = self._get_proxy(ssl=self.ssl)
 
     def _get_proxy(self, ssl=False):
         """Returns a :class:`Proxy <oerplib.rpc.jsonrpclib.Proxy>` instance
         corresponding to the server version used.
         """
+        proxy = jsonrpclib.Proxy(
+            self.server, self.port, self._timeout,
+            ssl=ssl, deserialize=self.deserialize)
         # Detect the server version
         if self.version is None:
-            proxy = jsonrpclib.Proxy(
-                self.server, self.port, self._timeout,
-                ssl=ssl, deserialize=self.deserialize)
-            result = proxy.web.webclient.version_info()['result']
+            try:
+                result = proxy.web.webclient.version_info()['result']
+            except Exception as exc:
+                raise error.ConnectorError(
+                    "Unable to detect the server version: {0}".format(exc))
             # Server 6.1
             if 'version' in result:
                 self.version = result['version']
@@ -214,12 +236,17 @@ class ConnectorJSONRPC(Connector):
             elif 'server_version' in result:
                 self.version = result['server_version']
         # Select the legacy proxy for OpenERP 6.1 and 7.0
-        if v(self.version)[:2] <= v('7.0'):
+        if self.version_info.info[:2] <= (7, 0):
             proxy = jsonrpclib.ProxyLegacy(
                 self.server, self.port, self._timeout,
                 ssl=ssl, deserialize=self.deserialize)
         return proxy
 
+    def __getattr__(self, service_name):
+        srv = service.ServiceJSONRPC(self, service_name)
+        setattr(self, service_name, srv)
+        return srv
+
     @property
     def proxy(self):
         return self._proxy
@@ -239,18 +266,14 @@ class ConnectorJSONRPCSSL(ConnectorJSONRPC):
     >>> from oerplib import rpc
     >>> cnt = rpc.ConnectorJSONRPCSSL('localhost', port=8069)
     """
-    def __init__(self, server, port=8069, timeout=120, version=None,
-                 deserialize=True):
-        super(ConnectorJSONRPCSSL, self).__init__(
-            server, port, timeout, version)
-        self._proxy = self._get_proxy(ssl=True)
+    ssl = True
 
 
 PROTOCOLS = {
     'xmlrpc': ConnectorXMLRPC,
     'xmlrpc+ssl': ConnectorXMLRPCSSL,
-    #'jsonrpc': ConnectorJSONRPC,
-    #'jsonrpc+ssl': ConnectorJSONRPCSSL,
+    'jsonrpc': ConnectorJSONRPC,
+    'jsonrpc+ssl': ConnectorJSONRPCSSL,
     'netrpc': ConnectorNetRPC,
 }
 
@@ -265,6 +288,8 @@ def get_connector(server, port=8069, protocol='xmlrpc',
 
         - ``xmlrpc``: Standard `XML-RPC` protocol (default),
         - ``xmlrpc+ssl``: `XML-RPC` protocol over `SSL`,
+        - ``jsonrpc``: `JSON-RPC` protocol (`OpenERP 6.1` and above),
+        - ``jsonrpc+ssl``: `JSON-RPC` protocol over `SSL`,
         - ``netrpc``: `Net-RPC` protocol (no longer available
           since `OpenERP 7.0`).
 
@@ -23,10 +23,16 @@ the NetRPC protocol.
 
 """
 
+import errno
 import socket
 import pickle
 import cStringIO
 
+try:
+    memoryview
+except NameError:   # Python 2.6
+    memoryview = None
+
 
 class NetRPCError(BaseException):
     """Exception raised by the NetRPC class when an error occured."""
@@ -36,8 +42,23 @@ class NetRPCError(BaseException):
         self.args = (faultCode, faultString)
 
 
+class NetRPCConnectionError(NetRPCError):
+    """Exception raised by the NetRPC class when the connection has been
+    closed by the server. `response_started` is `False` if no byte of the
+    response was received before.
+    """
+    def __init__(self, response_started=True):
+        super(NetRPCConnectionError, self).__init__(
+            "RuntimeError", "Socket connection broken")
+        self.response_started = response_started
+
+
 class NetRPC(object):
-    """Low level class for NetRPC protocol."""
+    """Low level class for NetRPC protocol.
+
+    The same socket can be used to send several requests in a row, as long as
+    no exception is raised by the server.
+    """
     def __init__(self, sock=None, timeout=120):
         if sock is None:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -52,41 +73,70 @@ class NetRPC(object):
         self.sock.connect((host, int(port)))
 
     def disconnect(self):
-        self.sock.shutdown(socket.SHUT_RDWR)
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
         self.sock.close()
 
+    close = disconnect
+
     def send(self, msg, exception=False, traceback=None):
         msg = pickle.dumps([msg, traceback])
-        size = len(msg)
-        self.sock.send('%8d' % size)
-        self.sock.send(exception and "1" or "0")
-        totalsent = 0
-        while totalsent < size:
-            sent = self.sock.send(msg[totalsent:])
-            if sent == 0:
-                raise NetRPCError("RuntimeError", "Socket connection broken")
-            totalsent = totalsent + sent
+        # Header and data sent at once (avoid the delay of the Nagle algorithm
+        # between several small packets)
+        self.sock.sendall(
+            '%8d%s%s' % (len(msg), exception and "1" or "0", msg))
+
+    def _receive_exactly(self, size, response_started=True):
+        """Receive exactly `size` bytes from the socket, in a buffer
+        allocated once. `response_started` tells if bytes of the response
+        were already received (see :class:`NetRPCConnectionError`).
+        """
+        if memoryview is None:
+            chunks = []
+            remaining = size
+            while remaining:
+                chunk = self._recv(
+                    remaining, response_started or remaining < size)
+                chunks.append(chunk)
+                remaining -= len(chunk)
+            return ''.join(chunks)
+        buf = bytearray(size)
+        view = memoryview(buf)
+        received = 0
+        while received < size:
+            received += self._recv(
+                size - received, response_started or received > 0,
+                view[received:])
+        return buf
+
+    def _recv(self, size, response_started, view=None):
+        """Receive up to `size` bytes (in `view` if supplied, the number of
+        bytes received being returned), and raise a
+        :class:`NetRPCConnectionError` if the connection has been closed
+        or reset by the server.
+        """
+        try:
+            if view is None:
+                result = self.sock.recv(size)
+            else:
+                result = self.sock.recv_into(view, size)
+        except socket.timeout:
+            raise
+        except socket.error as exc:
+            if exc.args and exc.args[0] in (errno.ECONNRESET, errno.EPIPE):
+                raise NetRPCConnectionError(response_started)
+            raise
+        if not result:
+            raise NetRPCConnectionError(response_started)
+        return result
 
     def receive(self):
-        buf = ''
-        while len(buf) < 8:
-            chunk = self.sock.recv(8 - len(buf))
-            if chunk == '':
-                raise NetRPCError("RuntimeError", "Socket connection broken")
-            buf += chunk
-        size = int(buf)
-        buf = self.sock.recv(1)
-        if buf != "0":
-            exception = buf
-        else:
-            exception = False
-        msg = ''
-        while len(msg) < size:
-            chunk = self.sock.recv(size - len(msg))
-            if chunk == '':
-                raise NetRPCError("RuntimeError", "Socket connection broken")
-            msg = msg + chunk
-        msgio = cStringIO.StringIO(msg)
+        header = self._receive_exactly(9, response_started=False)
+        size = int(str(header[:8]))
+        exception = header[8:9] != b"0"
+        msgio = cStringIO.StringIO(self._receive_exactly(size))
         unpickler = pickle.Unpickler(msgio)
         unpickler.find_global = None
         res = unpickler.load()
@@ -0,0 +1,116 @@
+# -*- coding: UTF-8 -*-
+##############################################################################
+#
+#    OERPLib
+#    Copyright (C) 2011-2013 Sébastien Alix.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""This module provides the :class:`ConnectionPool` class which keeps
+persistent connections to reuse them between `RPC` requests.
+"""
+import threading
+import time
+
+
+class ConnectionPool(object):
+    """Thread-safe pool of persistent connections grouped by key
+    (e.g. ``(scheme, host)``).
+
+    A connection is checked out of the pool with :func:`acquire` for the
+    duration of a request, then given back with :func:`release`.
+    At most `maxsize` idle connections are kept for each key, and connections
+    unused since more than `idle_timeout` seconds are closed
+    (`None` means no limit).
+    If `maxconn` is set, no more than `maxconn` connections can be checked
+    out at the same time: other threads wait for a connection to be released.
+    Connections have to provide a ``close()`` method.
+
+    >>> from oerplib.rpc.pool import ConnectionPool
+    >>> pool = ConnectionPool(maxsize=10, idle_timeout=60, maxconn=16)
+    >>> conn = pool.acquire(('http', 'localhost:8069'))   # None if no idle connection
+    >>> pool.release(('http', 'localhost:8069'), conn)
+    """
+    def __init__(self, maxsize=10, idle_timeout=60, maxconn=None):
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.maxconn = maxconn
+        self._cond = threading.Condition(threading.Lock())
+        self._in_use = 0
+        self._connections = {}
+
+    def acquire(self, key):
+        """Check out a connection slot for `key` and return an idle
+        connection opened for `key`, or `None` if there is no one available
+        (a new connection has then to be opened by the caller).
+        """
+        expired = []
+        conn = None
+        with self._cond:
+            while self.maxconn is not None and self._in_use >= self.maxconn:
+                self._cond.wait()
+            self._in_use += 1
+            conns = self._connections.get(key, [])
+            while conns:
+                conn, last_used = conns.pop()
+                if self._is_expired(last_used):
+                    expired.append(conn)
+                    conn = None
+                    continue
+                break
+        self._close(expired)
+        return conn
+
+    def release(self, key, conn):
+        """Give back the connection slot checked out for `key`, with the
+        connection `conn` to reuse for the next requests (`None` if the
+        connection has been closed).
+        """
+        discarded = []
+        with self._cond:
+            self._in_use = max(0, self._in_use - 1)
+            self._cond.notify()
+            conns = self._connections.setdefault(key, [])
+            # Evict connections unused for too long
+            while conns and self._is_expired(conns[0][1]):
+                discarded.append(conns.pop(0)[0])
+            if conn is not None:
+                if len(conns) < self.maxsize:
+                    conns.append((conn, time.time()))
+                else:
+                    discarded.append(conn)
+        self._close(discarded)
+
+    def clear(self):
+        """Close all idle connections."""
+        with self._cond:
+            discarded = [conn for conns in self._connections.itervalues()
+                         for conn, last_used in conns]
+            self._connections.clear()
+        self._close(discarded)
+
+    def _is_expired(self, last_used):
+        return self.idle_timeout is not None \
+            and time.time() - last_used > self.idle_timeout
+
+    @staticmethod
+    def _close(conns):
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+# vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
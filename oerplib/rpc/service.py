@@ -19,6 +19,9 @@
 #
 ##############################################################################
 
+import httplib
+import socket
+import urllib2
 import xmlrpclib
 
 from oerplib.rpc import netrpclib, xmlrpclib_custom, error
@@ -33,10 +36,13 @@ class ServiceXMLRPC(object):
     def __getattr__(self, method):
         def rpc_method(*args):
             try:
-                self._sock = xmlrpclib_custom.TimeoutServerProxy(
+                # A new proxy per request: connections are shared through
+                # the pool of the connector, so this is thread-safe
+                sock = xmlrpclib_custom.TimeoutServerProxy(
                     self._url, allow_none=True,
-                    timeout=self._connector.timeout)
-                sock_method = getattr(self._sock, method, False)
+                    timeout=self._connector.timeout,
+                    pool=self._connector.pool)
+                sock_method = getattr(sock, method, False)
                 return sock_method(*args)
             #NOTE: exception raised with these kind of requests:
             #   - execute('fake.model', 'search', [])
@@ -52,30 +58,162 @@ class ServiceXMLRPC(object):
         return rpc_method
 
 
+class _StaleSocket(Exception):
+    """Raised when a socket reused from the pool was closed by the server
+    before receiving the request (no response started): the request was
+    not processed and can be sent again on a new socket.
+    """
+
+
 class ServiceNetRPC(object):
+    """Service used by the `Net-RPC` protocol. Sockets are kept open in the
+    pool of the connector to be reused by the next requests.
+    """
     def __init__(self, connector, name, server, port):
         self._connector = connector
         self._name = name
         self._server = server
         self._port = port
 
+    def _request(self, sock, msg, reused=False):
+        """Send the `msg` request through `sock` and return the result.
+        If `sock` is `reused` from the pool and turns out to have been
+        closed by the server before processing the request, a
+        :class:`_StaleSocket` exception is raised so that the request can
+        be sent again safely.
+        """
+        sock.sock.settimeout(self._connector.timeout)
+        try:
+            sock.send(msg)
+        except socket.timeout:
+            raise
+        except socket.error:
+            if reused:
+                raise _StaleSocket()
+            raise
+        try:
+            return sock.receive()
+        except netrpclib.NetRPCConnectionError as exc:
+            if reused and not exc.response_started:
+                raise _StaleSocket()
+            raise
+
     def __getattr__(self, method):
         def rpc_method(*args):
+            msg = (self._name, method, ) + args
+            pool = self._connector.pool
+            key = (self._server, self._port)
+            sock = pool.acquire(key)
             try:
+                if sock is not None:
+                    # The socket may have been closed by the server since
+                    # the last request, in this case a new one is opened
+                    try:
+                        return self._request(sock, msg, reused=True)
+                    except _StaleSocket:
+                        sock.close()
                 sock = netrpclib.NetRPC(timeout=self._connector.timeout)
                 sock.connect(self._server, self._port)
-                sock.send((self._name, method, ) + args)
-                result = sock.receive()
-                sock.disconnect()
-                return result
+                return self._request(sock, msg)
             #NOTE: exception raised with these kind of requests:
             #   - execute('fake.model', 'search', [])
             #   - execute('sale.order', 'fake_method')
             except netrpclib.NetRPCError as exc:
+                # The server closes the connection after an error
+                sock.close()
+                sock = None
                 # faultCode: error message
                 # faultString: Server traceback (following the server version
                 # used, a bad request can produce a server traceback, or not).
                 raise error.ConnectorError(exc.faultCode, exc.faultString)
+            except:
+                if sock is not None:
+                    sock.close()
+                    sock = None
+                raise
+            finally:
+                pool.release(key, sock)
+        return rpc_method
+
+class ServiceJSONRPC(object):
+    """Provide the interface of `XML-RPC` services (``object``, ``common``,
+    ``db``...) over the `JSON-RPC` protocol.
+    Model methods and authentication go through the controllers of the
+    Web client (``/web/dataset/call_kw``, ``/web/dataset/exec_workflow`` and
+    ``/web/session/authenticate``), other methods through the ``/jsonrpc``
+    route (available since `Odoo 8.0`).
+
+    Connections are not kept alive, but each request checks out a slot of
+    the pool of the connector, so that no more than its ``maxconn``
+    connections are used at the same time. HTTP and network errors are
+    raised as :class:`ConnectorError <oerplib.rpc.error.ConnectorError>`
+    exceptions (except timeouts, raised as :class:`socket.timeout`).
+    """
+    def __init__(self, connector, name):
+        self._connector = connector
+        self._name = name
+
+    def __getattr__(self, method):
+        def rpc_method(*args):
+            pool = self._connector.pool
+            key = (self._connector.server, self._connector.port)
+            pool.acquire(key)
+            try:
+                return self._request(method, args)
+            except urllib2.URLError as exc:
+                # Timeout while connecting
+                if isinstance(exc.reason, socket.timeout):
+                    raise exc.reason
+                raise error.ConnectorError(str(exc))
+            except socket.timeout:
+                raise
+            except (httplib.HTTPException, socket.error) as exc:
+                raise error.ConnectorError(
+                    str(exc) or exc.__class__.__name__)
+            finally:
+                pool.release(key, None)
         return rpc_method
 
+    def _request(self, method, args):
+        """Send the request corresponding to `method` of the service
+        and return its result.
+        """
+        proxy = self._connector.proxy
+        # /object service: 'db', 'uid' and 'password' parameters are
+        # replaced by the session opened during the authentication
+        if self._name == 'object' and method == 'execute':
+            response = proxy.web.dataset.call_kw(
+                model=args[3], method=args[4],
+                args=list(args[5:]), kwargs={})
+        elif self._name == 'object' and method == 'execute_kw':
+            response = proxy.web.dataset.call_kw(
+                model=args[3], method=args[4],
+                args=args[5], kwargs=len(args) > 6 and args[6] or {})
+        elif self._name == 'object' and method == 'exec_workflow':
+            response = proxy.web.dataset.exec_workflow(
+                model=args[3], signal=args[4], id=args[5])
+        elif self._name == 'common' and method == 'login':
+            response = proxy.web.session.authenticate(
+                db=args[0], login=args[1], password=args[2],
+                base_location=None)
+            result = self._get_result(response)
+            return result and result.get('uid') or False
+        else:
+            response = proxy.jsonrpc(
+                service=self._name, method=method, args=args)
+        return self._get_result(response)
+
+    @staticmethod
+    def _get_result(response):
+        """Return the result of a `JSON-RPC` response, or raise the error
+        returned by the server.
+        """
+        if response.get('error'):
+            exc = response['error']
+            data = exc.get('data') or {}
+            message = data.get('fault_code') or data.get('message') \
+                or exc.get('message')
+            raise error.ConnectorError(message, data.get('debug'))
+        return response.get('result')
+
 # vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
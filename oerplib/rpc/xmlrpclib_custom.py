@@ -31,14 +31,21 @@ TimeoutSafeTransport = None
 
 
 class TimeoutServerProxy(xmlrpclib.ServerProxy):
-    """xmlrpclib.ServerProxy overload to manage the timeout of the socket."""
+    """xmlrpclib.ServerProxy overload to manage the timeout of the socket,
+    and to reuse persistent connections of a
+    :class:`ConnectionPool <oerplib.rpc.pool.ConnectionPool>`
+    (`pool` parameter).
+    """
     def __init__(self, *args, **kwargs):
         url = args[0]
         https_ok = urlparse(url).scheme == 'https'
         t = https_ok and TimeoutSafeTransport() or TimeoutTransport()
         t.timeout = kwargs.get('timeout', 120)
+        t.pool = kwargs.get('pool')
         if 'timeout' in kwargs:
             del kwargs['timeout']
+        if 'pool' in kwargs:
+            del kwargs['pool']
         kwargs['transport'] = t
         xmlrpclib.ServerProxy.__init__(self, *args, **kwargs)
 
@@ -95,6 +102,44 @@ if sys.version_info <= (2, 7):
 else:
     # Python 2.7 and 3.X
 
+    # -- Persistent connections support --
+
+    class PooledTransportPy27:
+        """Mixin for transports checking out their connections from a pool
+        for each request, and giving them back once the request is done.
+        """
+        scheme = 'http'
+        pool = None
+
+        def _get_connection(self, host, connection_class):
+            if self._connection and host == self._connection[0]:
+                return self._connection[1]
+
+            chost, self._extra_headers, x509 = self.get_host_info(host)
+            self._connection = host, connection_class(self.timeout, chost)
+            return self._connection[1]
+
+        def request(self, host, handler, request_body, verbose=0):
+            if self.pool is None:
+                return xmlrpclib.Transport.request(
+                    self, host, handler, request_body, verbose)
+            key = (self.scheme, host)
+            conn = self.pool.acquire(key)
+            if conn is not None:
+                conn.timeout = self.timeout
+                if conn.sock:
+                    conn.sock.settimeout(self.timeout)
+                self._connection = host, conn
+            try:
+                return xmlrpclib.Transport.request(
+                    self, host, handler, request_body, verbose)
+            finally:
+                # The connection is closed and reset by the transport
+                # if an unexpected error occurred
+                conn = self._connection[1]
+                self._connection = (None, None)
+                self.pool.release(key, conn)
+
     # -- xmlrpclib.Transport with timeout support --
 
     class TimeoutHTTPConnectionPy27(httplib.HTTPConnection):
@@ -106,20 +151,14 @@ else:
             httplib.HTTPConnection.connect(self)
             self.sock.settimeout(self.timeout)
 
-    class TimeoutTransportPy27(xmlrpclib.Transport):
+    class TimeoutTransportPy27(PooledTransportPy27, xmlrpclib.Transport):
         def __init__(self, timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
                      *args, **kwargs):
             xmlrpclib.Transport.__init__(self, *args, **kwargs)
             self.timeout = timeout
 
         def make_connection(self, host):
-            if self._connection and host == self._connection[0]:
-                return self._connection[1]
-
-            chost, self._extra_headers, x509 = self.get_host_info(host)
-            self._connection = host, TimeoutHTTPConnectionPy27(
-                self.timeout, chost)
-            return self._connection[1]
+            return self._get_connection(host, TimeoutHTTPConnectionPy27)
 
     # -- xmlrpclib.SafeTransport with timeout support --
 
@@ -132,20 +171,17 @@ else:
             httplib.HTTPSConnection.connect(self)
             self.sock.settimeout(self.timeout)
 
-    class TimeoutSafeTransportPy27(xmlrpclib.SafeTransport):
+    class TimeoutSafeTransportPy27(PooledTransportPy27,
+                                   xmlrpclib.SafeTransport):
+        scheme = 'https'
+
         def __init__(self, timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
                      *args, **kwargs):
             xmlrpclib.SafeTransport.__init__(self, *args, **kwargs)
             self.timeout = timeout
 
         def make_connection(self, host):
-            if self._connection and host == self._connection[0]:
-                return self._connection[1]
-
-            chost, self._extra_headers, x509 = self.get_host_info(host)
-            self._connection = host, TimeoutHTTPSConnectionPy27(
-                self.timeout, chost)
-            return self._connection[1]
+            return self._get_connection(host, TimeoutHTTPSConnectionPy27)
 
     # Define the TimeTransport and TimeSafeTransport class version to use
     TimeoutTransport = TimeoutTransportPy27
@@ -24,7 +24,6 @@ between server modules.
 import copy
 
 from oerplib import error
-from oerplib.tools import v
 
 TPL_MODULE = """<
 <table cellborder="0" cellpadding="0" cellspacing="0"
@@ -125,7 +124,7 @@ class Dependencies(object):
         res = {}
         # OpenERP v5 does not have the 'modules' field on 'ir.model' used to
         # bound a data model and its related modules.
-        if v(self.oerp.version) <= v('6.0'):
+        if not self.oerp.version_info.has_model_modules:
             return res
         models_patterns = \
             [pattern2oerp(model) for model in (models)]
@@ -21,5 +21,7 @@
 
 from oerplib.service.osv.browse import BrowseRecord
 from oerplib.service.osv.osv import Model
+from oerplib.service.osv.recordset import RecordSet
+from oerplib.service.osv.unitofwork import UnitOfWork
 
 # vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
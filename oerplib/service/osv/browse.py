@@ -19,8 +19,134 @@
 #
 ##############################################################################
 """This module provides the BrowseRecord class."""
+import collections
+
 from oerplib import error
 
+# Marker of a value not stored in a 'RecordValues' instance
+_MISSING = object()
+
+
+class RecordValues(object):
+    """Compact storage of the field values of a browsable record, behaving
+    like a dictionary. Values are stored in a list ordered as the columns of
+    the model, `index` being the dictionary ``{field_name: position}``
+    shared by all the records of the model (other keys are stored in a
+    dictionary allocated on demand).
+    """
+    __slots__ = ('_index', '_values', '_extra')
+    __hash__ = None
+
+    def __init__(self, index, data=None):
+        self._index = index
+        self._values = [_MISSING] * len(index)
+        self._extra = None
+        if data:
+            self.update(data)
+
+    def __getitem__(self, key):
+        pos = self._index.get(key)
+        if pos is not None:
+            value = self._values[pos]
+            if value is not _MISSING:
+                return value
+        elif self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        pos = self._index.get(key)
+        if pos is not None:
+            self._values[pos] = value
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        pos = self._index.get(key)
+        if pos is not None:
+            self._values[pos] = _MISSING
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key):
+        pos = self._index.get(key)
+        if pos is not None:
+            return self._values[pos] is not _MISSING
+        return bool(self._extra) and key in self._extra
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def update(self, data):
+        for key, value in data.iteritems():
+            self[key] = value
+
+    def iteritems(self):
+        values = self._values
+        for key, pos in self._index.iteritems():
+            if values[pos] is not _MISSING:
+                yield key, values[pos]
+        if self._extra:
+            for item in self._extra.iteritems():
+                yield item
+
+    def iterkeys(self):
+        for key, _ in self.iteritems():
+            yield key
+
+    def itervalues(self):
+        for _, value in self.iteritems():
+            yield value
+
+    __iter__ = iterkeys
+
+    def items(self):
+        return list(self.iteritems())
+
+    def keys(self):
+        return list(self.iterkeys())
+
+    def values(self):
+        return list(self.itervalues())
+
+    def copy(self):
+        return dict(self.iteritems())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, RecordValues):
+            other = other.copy()
+        return self.copy() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(self.copy())
+
+
+class _ReadOnlyDict(dict):
+    """Dictionary which can not be modified."""
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("This dictionary can not be modified")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+
+# Updated values shared by the records not updated (replaced by a new
+# dictionary on the first update)
+NO_UPDATED_VALUES = _ReadOnlyDict()
+
 
 class BrowseRecord(object):
     """Base class that all browsable records inherit from.
@@ -51,6 +177,24 @@ class BrowseRecord(object):
                     'company_id': [1, 'Your Company'],
                     ...}}
 
+    Since the version `0.9`, ``values`` and ``raw_data`` refer to the same
+    compact :class:`RecordValues` mapping, and the ``updated_values``
+    dictionary is only allocated on the first update of the record.
+
+    .. warning::
+
+        These changes are backward-incompatible:
+
+        - browsable records define ``__slots__`` and so do not accept other
+          attributes than their fields (an :class:`AttributeError` is
+          raised);
+        - ``updated_values`` is a read-only dictionary shared by the records
+          not updated yet, modifying it directly raises a
+          :class:`TypeError` (update the fields of the record instead);
+        - ``values`` and ``raw_data`` are no longer :class:`dict` instances.
+
+        ``__data__`` itself is still a dictionary per record.
+
     In the same way, information about the model class and its columns may be
     obtained via the ``__osv__`` attribute::
 
@@ -59,15 +203,26 @@ class BrowseRecord(object):
                      'active': <oerplib.service.osv.fields.ValueField object at 0xb7598b6c>,
                      'company_id': <oerplib.service.osv.fields.Many2OneField object at 0xb757868c>,
                      ...},
+         'model': Model('res.users'),
          'name': 'res.users'}
 
+    Since the version `0.9`, ``model`` is the :class:`Model
+    <oerplib.service.osv.Model>` instance which generated the class of the
+    record, used by the methods of :class:`OERP <oerplib.OERP>` operating on
+    records (:func:`write_record <oerplib.OERP.write_record>`,
+    :func:`refresh <oerplib.OERP.refresh>`, ...) without fetching its
+    fields again.
+
     """
+    __slots__ = ('_id', '__data__', '__weakref__')
     __oerp__ = None
     __osv__ = None
 
     def __init__(self, o_id):
         self._id = o_id
-        self.__data__ = {'values': {}, 'raw_data': {}, 'updated_values': {}}
+        values = {}
+        self.__data__ = {'values': values, 'raw_data': values,
+                         'updated_values': NO_UPDATED_VALUES}
 
     @property
     def id(self):
@@ -107,9 +262,21 @@ class BrowseRecordIterator(object):
     """Iterator of browsable records.
     In fact, it is a generator to return records one by one, and able to
     increment/decrement records by overriding '+=' and '-=' operators.
+
+    Records are prefetched by chunks (see the ``prefetch_size`` option of
+    :attr:`oerplib.OERP.config`), so that only one request is sent to the
+    server to read each chunk.
+    Records already fetched can be supplied with the `records` dictionary
+    (``{ID: browse_record}``, updated with the records fetched), and the
+    `prefetch_ids` list gives IDs of other records to fetch at the same time
+    to complete a chunk. Only the `fields` listed are read if specified.
+    If a chunk can not be read (a record is missing or inaccessible), its
+    records are read one by one, so that the error is raised only when the
+    faulty record is reached.
     """
     def __init__(self, model, ids, context=None,
-                 parent=None, parent_field=None):
+                 parent=None, parent_field=None,
+                 records=None, prefetch_ids=None, fields=None):
         self.model = model
         self.ids = ids
         self.context = context
@@ -118,6 +285,12 @@ class BrowseRecordIterator(object):
             self.index = 0
         self.parent = parent
         self.parent_field = parent_field
+        self._records = collections.deque()
+        self._cache = records
+        self._prefetch_ids = prefetch_ids or []
+        self._fields = fields
+        # Records are read one by one up to this index (chunk failing)
+        self._one_by_one = 0
 
     def __len__(self):
         return len(self.ids)
@@ -129,9 +302,61 @@ class BrowseRecordIterator(object):
         if self.index is None or self.index >= len(self.ids):
             raise StopIteration
         else:
-            id_ = self.ids[self.index]
+            if not self._records:
+                self._fetch_records()
             self.index += 1
-            return self.model.browse(id_, context=self.context)
+            return self._records.popleft()
+
+    def _fetch_records(self):
+        """Fetch the next chunk of records."""
+        size = max(1, self.model._oerp.config['prefetch_size'])
+        if self.index < self._one_by_one:
+            size = 1
+        ids = self.ids[self.index:self.index + size]
+        cache = self._cache
+        if cache is None:
+            cache = {}
+        missing = []
+        missing_set = set()
+        for id_ in ids:
+            if id_ not in cache and id_ not in missing_set:
+                missing.append(id_)
+                missing_set.add(id_)
+        if missing:
+            count = len(missing)
+            # Complete the chunk with the other records to prefetch
+            for id_ in self._prefetch_ids:
+                if len(missing) >= size:
+                    break
+                if id_ not in cache and id_ not in missing_set:
+                    missing.append(id_)
+                    missing_set.add(id_)
+            try:
+                records = self.model._browse_records(
+                    missing, context=self.context, fields=self._fields)
+            except error.RPCError:
+                # Prefetching other records is best-effort (they may be
+                # inaccessible to the user): read the records of the chunk
+                if len(missing) == count:
+                    records = None
+                else:
+                    try:
+                        records = self.model._browse_records(
+                            missing[:count], context=self.context,
+                            fields=self._fields)
+                    except error.RPCError:
+                        records = None
+                if records is None:
+                    if count == 1:
+                        raise
+                    # A record of the chunk is missing or inaccessible:
+                    # records are read one by one to return the ones
+                    # preceding it before raising the error
+                    self._one_by_one = self.index + len(ids)
+                    return self._fetch_records()
+            for record in records:
+                cache[record.id] = record
+        self._records.extend(cache[id_] for id_ in ids)
 
     def __iadd__(self, records):
         if not self.parent or not self.parent_field:
@@ -0,0 +1,166 @@
+# -*- coding: UTF-8 -*-
+##############################################################################
+#
+#    OERPLib
+#    Copyright (C) 2013 Sébastien Alix.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""This module provides the functions used by the
+:func:`oerplib.service.osv.Model.export` method to write records on the disk.
+"""
+import csv
+import json
+
+from oerplib import error
+
+FORMATS = ['csv', 'jsonl', 'parquet']
+
+# Types of Parquet columns by type of field (strings by default)
+PARQUET_TYPES = {
+    'integer': 'int64',
+    'float': 'float64',
+    'monetary': 'float64',
+    'boolean': 'bool_',
+}
+
+
+def get_headers(columns, fields):
+    """Return the names of the columns exported for `fields`
+    (many2one fields being flattened in two columns).
+    """
+    headers = ['id']
+    for name in fields:
+        headers.append(name)
+        if columns[name].type == 'many2one':
+            headers.append('{0}.name'.format(name))
+    return headers
+
+
+def get_types(columns, fields):
+    """Return the types of the columns exported for `fields`."""
+    types = ['integer']
+    for name in fields:
+        if columns[name].type == 'many2one':
+            types.extend(['integer', 'char'])
+        else:
+            types.append(columns[name].type)
+    return types
+
+
+def flatten(columns, fields, row):
+    """Return the list of values exported for `row`, as returned by the
+    ``read`` method: many2one ``[id, name]`` pairs are flattened, and
+    `False` values are replaced by `None` (except for boolean fields).
+    """
+    values = [row['id']]
+    for name in fields:
+        value = row.get(name, False)
+        type_ = columns[name].type
+        if type_ == 'many2one':
+            if value:
+                values.extend(value[:2])
+            else:
+                values.extend([None, None])
+        elif type_ == 'boolean':
+            values.append(bool(value))
+        elif value is False:
+            values.append(None)
+        else:
+            values.append(value)
+    return values
+
+
+def _encode(value):
+    """Return `value` as written in a CSV file."""
+    if isinstance(value, list):
+        return ','.join(str(item) for item in value)
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return value
+
+
+def write_csv(path, headers, rows):
+    """Write `rows` (lists of values) in the CSV file `path`,
+    and return the number of rows written.
+    """
+    count = 0
+    with open(path, 'wb') as file_:
+        writer = csv.writer(file_)
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow([_encode(value) for value in row])
+            count += 1
+    return count
+
+
+def write_jsonl(path, headers, rows):
+    """Write `rows` (lists of values) in the `JSON Lines` file `path`,
+    and return the number of rows written.
+    """
+    count = 0
+    with open(path, 'wb') as file_:
+        for row in rows:
+            file_.write(json.dumps(dict(zip(headers, row))))
+            file_.write('\n')
+            count += 1
+    return count
+
+
+def write_parquet(path, headers, types, rows, chunk):
+    """Write `rows` (lists of values) in the Parquet file `path`, by row
+    groups of `chunk` rows, and return the number of rows written.
+    `types` are the types of the columns (see :func:`get_types`).
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise error.InternalError("'pyarrow' module not found")
+    arrow_types = []
+    for type_ in types:
+        if type_ in ['one2many', 'many2many']:
+            arrow_types.append(pyarrow.list_(pyarrow.int64()))
+        else:
+            arrow_types.append(
+                getattr(pyarrow, PARQUET_TYPES.get(type_, 'string'))())
+    schema = pyarrow.schema(
+        [pyarrow.field(name, type_)
+         for name, type_ in zip(headers, arrow_types)])
+    writer = pyarrow.parquet.ParquetWriter(path, schema)
+
+    def write(buffer_):
+        arrays = [pyarrow.array(list(values), type=type_)
+                  for values, type_ in zip(zip(*buffer_), arrow_types)]
+        writer.write_table(
+            pyarrow.Table.from_arrays(arrays, schema=schema))
+
+    count = 0
+    try:
+        buffer_ = []
+        for row in rows:
+            buffer_.append(row)
+            count += 1
+            if len(buffer_) >= chunk:
+                write(buffer_)
+                buffer_ = []
+        if buffer_:
+            write(buffer_)
+    finally:
+        writer.close()
+    return count
+
+
+# vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
@@ -90,6 +90,7 @@ class BaseField(object):
         self.readonly = 'readonly' in data and data['readonly'] or False
         self.help = 'help' in data and data['help'] or False
         self.states = 'states' in data and data['states'] or False
+        self.store = bool(data.get('store', True))
 
     def __get__(self, instance, owner):
         pass
@@ -97,6 +98,35 @@ class BaseField(object):
     def __set__(self, instance, value):
         pass
 
+    def get_value(self, instance):
+        """Return the value of the field for `instance` as fetched from the
+        server (changes made locally are not taken into account).
+        A value not fetched yet (`None`) is read on the fly, for `instance`
+        and all the records prefetched with it.
+        """
+        try:
+            value = instance.__data__['values'][self.name]
+        except KeyError:
+            # Field not returned by the server
+            raise AttributeError(
+                "'{0}' object has no attribute '{1}'".format(
+                    instance.__class__.__name__, self.name))
+        if value is None and instance.id:
+            self.osv._fetch_field(instance, self.name)
+            value = instance.__data__['values'][self.name]
+        return value
+
+    def set_value(self, instance, value):
+        """Store `value` as the new value of the field for `instance`
+        (to be sent to the server), and register `instance` in the unit of
+        work in progress if any (see :func:`oerplib.OERP.session`).
+        """
+        obj_data = instance.__data__
+        if obj_data['updated_values'] is browse.NO_UPDATED_VALUES:
+            obj_data['updated_values'] = {}
+        obj_data['updated_values'][self.name] = value
+        self.osv._oerp._track_record(instance)
+
     def __str__(self):
         """Return a human readable string representation of the field."""
         attrs = ['string', 'relation', 'required', 'readonly', 'size', 'domain']
@@ -142,11 +172,11 @@ class SelectionField(BaseField):
     def __get__(self, instance, owner):
         if self.name in instance.__data__['updated_values']:
             return instance.__data__['updated_values'][self.name]
-        return instance.__data__['values'][self.name]
+        return self.get_value(instance)
 
     def __set__(self, instance, value):
         value = self.check_value(value)
-        instance.__data__['updated_values'][self.name] = value
+        self.set_value(instance, value)
 
     def check_value(self, value):
         super(SelectionField, self).check_value(value)
@@ -172,16 +202,8 @@ class Many2ManyField(BaseField):
 
     def __get__(self, instance, owner):
         """Return a generator to iterate on ``browse_record`` instances."""
-        ids = None
-        if instance.__data__['values'][self.name]:
-            ids = instance.__data__['values'][self.name][:]
-        # None value => get the value on the fly
-        if ids is None:
-            orig_ids = instance.__oerp__.read(
-                instance.__osv__['name'],
-                [instance.id], [self.name])[0][self.name]
-            instance.__data__['values'][self.name] = orig_ids
-            ids = orig_ids and orig_ids[:] or []
+        ids = self.get_value(instance)
+        ids = ids and ids[:] or []
         # Take updated values into account
         if self.name in instance.__data__['updated_values']:
             ids = ids or []
@@ -198,12 +220,20 @@ class Many2ManyField(BaseField):
                     ids.remove(value[1])
         context = instance.__data__['context'].copy()
         context.update(self.context)
+        # Records targeted by the records prefetched with 'instance' are
+        # fetched at the same time
+        prefetch = instance.__data__['prefetch']
+        prefetch_ids = []
+        for rec in prefetch['records']:
+            prefetch_ids.extend(rec.__data__['values'].get(self.name) or [])
         return browse.BrowseRecordIterator(
             model=instance.__oerp__.get(self.relation),
             ids=ids,
             context=context,
             parent=instance,
-            parent_field=self)
+            parent_field=self,
+            records=prefetch['fields'].setdefault(self.name, {}),
+            prefetch_ids=prefetch_ids)
 
     def __set__(self, instance, value):
         value = self.check_value(value)
@@ -211,7 +241,7 @@ class Many2ManyField(BaseField):
             value = [(6, 0, records2ids(value))]
         elif not value:
             value = [(5, )]
-        instance.__data__['updated_values'][self.name] = value
+        self.set_value(instance, value)
 
     def check_value(self, value):
         if value:
@@ -230,22 +260,40 @@ class Many2OneField(BaseField):
         self.domain = 'domain' in data and data['domain'] or False
 
     def __get__(self, instance, owner):
-        id_ = instance.__data__['values'][self.name]
+        context = instance.__data__['context'].copy()
+        context.update(self.context)
         if self.name in instance.__data__['updated_values']:
             id_ = instance.__data__['updated_values'][self.name]
             # FIXME if id_ is a browse_record
-        # None value => get the value on the fly
-        if id_ is None:
-            id_ = instance.__oerp__.read(
-                instance.__osv__['name'],
-                [instance.id], [self.name])[0][self.name]
-            instance.__data__['values'][self.name] = id_
-        if id_:
-            context = instance.__data__['context'].copy()
-            context.update(self.context)
-            return instance.__class__.__oerp__.browse(
-                self.relation, id_[0], context)
-        return False
+            if id_:
+                return instance.__class__.__oerp__.browse(
+                    self.relation, id_[0], context)
+            return False
+        id_ = self.get_value(instance)
+        if not id_:
+            return False
+        # Records targeted by the records prefetched with 'instance' are
+        # fetched at the same time
+        prefetch = instance.__data__['prefetch']
+        records = prefetch['fields'].setdefault(self.name, {})
+        if id_[0] not in records:
+            ids = set([id_[0]])
+            for rec in prefetch['records']:
+                value = rec.__data__['values'].get(self.name)
+                if value and value[0] not in records:
+                    ids.add(value[0])
+            model = instance.__oerp__.get(self.relation)
+            try:
+                fetched = model._browse_records(list(ids), context)
+            except error.RPCError:
+                # Prefetching is best-effort (targets of the other records
+                # may be inaccessible to the user): read the target alone
+                if len(ids) == 1:
+                    raise
+                fetched = model._browse_records([id_[0]], context)
+            for rec in fetched:
+                records[rec.id] = rec
+        return records[id_[0]]
 
     def __set__(self, instance, value):
         if isinstance(value, browse.BrowseRecord):
@@ -258,8 +306,7 @@ class Many2OneField(BaseField):
             raise ValueError("Value supplied has to be an integer, "
                              "a browse_record object or False.")
         o_rel = self.check_value(o_rel)
-        instance.__data__['updated_values'][self.name] = \
-            o_rel and [o_rel.id, False]
+        self.set_value(instance, o_rel and [o_rel.id, False])
 
     def check_value(self, value):
         super(Many2OneField, self).check_value(value)
@@ -283,16 +330,8 @@ class One2ManyField(BaseField):
 
     def __get__(self, instance, owner):
         """Return a generator to iterate on ``browse_record`` instances."""
-        ids = None
-        if instance.__data__['values'][self.name]:
-            ids = instance.__data__['values'][self.name][:]
-        # None value => get the value on the fly
-        if ids is None:
-            orig_ids = instance.__oerp__.read(
-                instance.__osv__['name'],
-                [instance.id], [self.name])[0][self.name]
-            instance.__data__['values'][self.name] = orig_ids
-            ids = orig_ids and orig_ids[:] or []
+        ids = self.get_value(instance)
+        ids = ids and ids[:] or []
         # Take updated values into account
         if self.name in instance.__data__['updated_values']:
             ids = ids or []
@@ -309,12 +348,20 @@ class One2ManyField(BaseField):
                     ids.remove(value[1])
         context = instance.__data__['context'].copy()
         context.update(self.context)
+        # Records targeted by the records prefetched with 'instance' are
+        # fetched at the same time
+        prefetch = instance.__data__['prefetch']
+        prefetch_ids = []
+        for rec in prefetch['records']:
+            prefetch_ids.extend(rec.__data__['values'].get(self.name) or [])
         return browse.BrowseRecordIterator(
             model=instance.__oerp__.get(self.relation),
             ids=ids,
             context=context,
             parent=instance,
-            parent_field=self)
+            parent_field=self,
+            records=prefetch['fields'].setdefault(self.name, {}),
+            prefetch_ids=prefetch_ids)
 
     def __set__(self, instance, value):
         value = self.check_value(value)
@@ -322,7 +369,7 @@ class One2ManyField(BaseField):
             value = [(6, 0, records2ids(value))]
         elif not value:
             value = [(5, )]
-        instance.__data__['updated_values'][self.name] = value
+        self.set_value(instance, value)
 
     def check_value(self, value):
         if value:
@@ -343,29 +390,56 @@ class ReferenceField(BaseField):
         self.selection = 'selection' in data and data['selection'] or False
 
     def __get__(self, instance, owner):
-        value = instance.__data__['values'][self.name]
+        context = instance.__data__['context'].copy()
+        context.update(self.context)
         if self.name in instance.__data__['updated_values']:
             value = instance.__data__['updated_values'][self.name]
-        # None value => get the value on the fly
-        if value is None:
-            value = instance.__oerp__.read(
-                instance.__osv__['name'],
-                [instance.id], [self.name])[0][self.name]
-            instance.__data__['values'][self.name] = value
-        if value:
-            relation, sep, o_id = value.rpartition(',')
-            relation = relation.strip()
-            o_id = int(o_id.strip())
+            relation, o_id = self._parse_value(value)
             if relation and o_id:
-                context = instance.__data__['context'].copy()
-                context.update(self.context)
                 return instance.__class__.__oerp__.browse(
                     relation, o_id, context)
-        return False
+            return False
+        relation, o_id = self._parse_value(self.get_value(instance))
+        if not relation or not o_id:
+            return False
+        # Records of the same model targeted by the records prefetched
+        # with 'instance' are fetched at the same time
+        prefetch = instance.__data__['prefetch']
+        records = prefetch['fields'].setdefault(self.name, {})
+        if (relation, o_id) not in records:
+            ids = set([o_id])
+            for rec in prefetch['records']:
+                rec_relation, rec_id = self._parse_value(
+                    rec.__data__['values'].get(self.name))
+                if rec_relation == relation and rec_id \
+                        and (relation, rec_id) not in records:
+                    ids.add(rec_id)
+            model = instance.__oerp__.get(relation)
+            try:
+                fetched = model._browse_records(list(ids), context)
+            except error.RPCError:
+                # Prefetching is best-effort (targets of the other records
+                # may be inaccessible to the user): read the target alone
+                if len(ids) == 1:
+                    raise
+                fetched = model._browse_records([o_id], context)
+            for rec in fetched:
+                records[(relation, rec.id)] = rec
+        return records[(relation, o_id)]
+
+    @staticmethod
+    def _parse_value(value):
+        """Return the model and the ID referenced by `value`
+        (a ``'{relation},{id}'`` string).
+        """
+        if not value:
+            return False, False
+        relation, sep, o_id = value.rpartition(',')
+        return relation.strip(), int(o_id.strip())
 
     def __set__(self, instance, value):
         value = self.check_value(value)
-        instance.__data__['updated_values'][self.name] = value
+        self.set_value(instance, value)
 
     def _check_relation(self, relation):
         selection = [val[0] for val in self.selection]
@@ -409,9 +483,10 @@ class DateField(BaseField):
         super(DateField, self).__init__(osv, name, data)
 
     def __get__(self, instance, owner):
-        value = instance.__data__['values'][self.name]
         if self.name in instance.__data__['updated_values']:
             value = instance.__data__['updated_values'][self.name]
+        else:
+            value = self.get_value(instance)
         try:
             res = datetime.datetime.strptime(value, self.pattern).date()
         except Exception:  # ValueError, TypeError
@@ -420,7 +495,7 @@ class DateField(BaseField):
 
     def __set__(self, instance, value):
         value = self.check_value(value)
-        instance.__data__['updated_values'][self.name] = value
+        self.set_value(instance, value)
 
     def check_value(self, value):
         super(DateField, self).check_value(value)
@@ -449,9 +524,10 @@ class DateTimeField(BaseField):
         super(DateTimeField, self).__init__(osv, name, data)
 
     def __get__(self, instance, owner):
-        value = instance.__data__['values'][self.name]
         if self.name in instance.__data__['updated_values']:
             value = instance.__data__['updated_values'][self.name]
+        else:
+            value = self.get_value(instance)
         try:
             res = datetime.datetime.strptime(value, self.pattern)
         except Exception:  # ValueError, TypeError
@@ -460,7 +536,7 @@ class DateTimeField(BaseField):
 
     def __set__(self, instance, value):
         value = self.check_value(value)
-        instance.__data__['updated_values'][self.name] = value
+        self.set_value(instance, value)
 
     def check_value(self, value):
         super(DateTimeField, self).check_value(value)
@@ -496,11 +572,11 @@ class ValueField(BaseField):
     def __get__(self, instance, owner):
         if self.name in instance.__data__['updated_values']:
             return instance.__data__['updated_values'][self.name]
-        return instance.__data__['values'][self.name]
+        return self.get_value(instance)
 
     def __set__(self, instance, value):
         value = self.check_value(value)
-        instance.__data__['updated_values'][self.name] = value
+        self.set_value(instance, value)
 
 
 def generate_field(osv, name, data):
@@ -23,10 +23,10 @@ methods proposed by a data model."""
 
 import sys  # to check Python version at runtime
 import collections
+import threading
 
-from oerplib.tools import v
 from oerplib import error
-from oerplib.service.osv import fields, browse
+from oerplib.service.osv import fields, browse, recordset, export
 
 
 class Model(object):
@@ -47,6 +47,10 @@ class Model(object):
     >>> user_obj.name_get(user.id) # Use any methods from the model instance
     [[1, 'Administrator']]
 
+    Since the version `0.9`, the fields of the model are fetched from the
+    server only when they are needed (on the first browsed record), so
+    calling its methods does not send any ``fields_get`` request.
+
     .. warning::
 
         The only method implemented in this class is ``browse``. Except this
@@ -62,9 +66,32 @@ class Model(object):
         super(Model, self).__init__()
         self._oerp = oerp
         self._name = model
-        self._browse_class = self._generate_browse_class()
+        self._browse_class_lock = threading.Lock()
+        self._browse_class_cache = None
+
+    @property
+    def _browse_class(self):
+        """Class of the browsable records of the model, generated on the
+        first access (the fields of the model are not fetched as long as
+        only its methods are called).
 
-    def browse(self, ids, context=None):
+        """
+        if self._browse_class_cache is None:
+            with self._browse_class_lock:
+                if self._browse_class_cache is None:
+                    try:
+                        self._browse_class_cache = \
+                            self._generate_browse_class()
+                    except AttributeError as exc:
+                        # Not to be hidden by '__getattr__' (which would
+                        # look for a RPC method named '_browse_class')
+                        raise error.InternalError(
+                            "Unable to generate the browse class of "
+                            "'{0}': {1}".format(self._name, exc)), \
+                            None, sys.exc_info()[2]
+        return self._browse_class_cache
+
+    def browse(self, ids, context=None, fields=None):
         """Browse one or several records (if `ids` is a list of IDs)
         from `model`. The fields and values for such objects are generated
         dynamically.
@@ -78,30 +105,354 @@ class Model(object):
         A list of data types used by ``browse_record`` fields are
         available :ref:`here <fields>`.
 
+        .. versionadded:: 0.9
+
+            Only the `fields` listed are read with the records if specified,
+            other ones being fetched on their first access (for all the
+            records browsed at the same time, see also the ``deferred_types``
+            option of :attr:`oerplib.OERP.config`):
+
+            >>> for product in oerp.get('product.product').browse(
+            ...         product_ids, fields=['name', 'default_code']):
+            ...     print(product.name)
+
         :return: a ``browse_record`` instance
         :return: a generator to iterate on ``browse_record`` instances
         :raise: :class:`oerplib.error.RPCError`
 
         """
         if isinstance(ids, list):
-            return browse.BrowseRecordIterator(self, ids, context=context)
+            return browse.BrowseRecordIterator(
+                self, ids, context=context, fields=fields)
             #return browse.BrowseRecordIterator(
             #    model=self,
             #    ids=ids,
             #    context=context)
         else:
-            obj = self._browse_class(ids)
-            self._refresh(obj, context)
-            return obj
+            return self._browse_records([ids], context, fields)[0]
             #return self.browse(ids, context)
 
+    def iter_search_read(self, domain=None, fields=None, chunk=2000,
+                         order='id', context=None):
+        """.. versionadded:: 0.9
+
+        Return a generator of dictionaries (as returned by the ``read``
+        method) of records matching the `domain` criteria. Records are
+        fetched by chunks of `chunk` records (one request per chunk),
+        so the memory used stays bounded whatever the number of records
+        and the first records are available before the end of the search.
+
+        >>> for data in oerp.get('res.partner').iter_search_read(
+        ...         [('customer', '=', True)], ['name'], chunk=1000):
+        ...     print(data['name'])
+
+        Records are ordered by `order`. When ordered by ID (default), chunks
+        are fetched with the ``('id', '>', last_id)`` criteria instead of
+        an offset, which is faster on big tables and not disturbed by
+        records created or deleted meanwhile.
+
+        .. note::
+
+            The ``search_read`` method is used on servers in version
+            `8.0` and above, ``search`` then ``read`` on previous versions.
+
+        :return: a generator of dictionaries
+        :raise: :class:`oerplib.error.RPCError`
+        """
+        context = context or self._oerp.context
+        domain = domain or []
+        fields = fields or []
+        keyset = order in ['id', 'id asc', 'id ASC']
+        last_id = 0
+        offset = 0
+        while True:
+            if keyset:
+                chunk_domain = [('id', '>', last_id)] + list(domain)
+                chunk_offset = 0
+            else:
+                chunk_domain = domain
+                chunk_offset = offset
+            if self._oerp.version_info.has_search_read:
+                data = self.search_read(
+                    chunk_domain, fields, chunk_offset, chunk, order,
+                    context=context)
+            else:
+                data = self._search_read_legacy(
+                    chunk_domain, fields, chunk_offset, chunk, order, context)
+            for row in data:
+                yield row
+            if len(data) < chunk:
+                break
+            last_id = data[-1]['id']
+            offset += len(data)
+
+    def _search_read_legacy(self, domain, fields, offset, limit, order,
+                            context):
+        """Emulate the ``search_read`` method with ``search`` and ``read``
+        (for servers prior to the version `8.0`).
+
+        """
+        if not self._oerp.version_info.supports_kwargs:
+            ids = self.search(domain, offset, limit, order, context)
+            data = ids and self.read(ids, fields, context) or []
+        else:
+            ids = self.search(
+                domain, offset, limit, order, context=context)
+            data = ids and self.read(ids, fields, context=context) or []
+        # 'read' does not keep the order of IDs
+        rows = {}
+        for row in data:
+            rows[row['id']] = row
+        return [rows[id_] for id_ in ids if id_ in rows]
+
+    def recordset(self, ids=None, fields=None, domain=None, order='id',
+                  context=None):
+        """.. versionadded:: 0.9
+
+        Return a :class:`RecordSet <oerplib.service.osv.RecordSet>` storing
+        column-wise the values of `fields` of the records `ids`, or of the
+        records matching the `domain` criteria if `ids` is not specified
+        (ordered by `order`). Records are read by chunks (see the
+        ``prefetch_size`` option of :attr:`oerplib.OERP.config`), and
+        no browsable record is created.
+
+        >>> invoices = oerp.get('account.invoice').recordset(
+        ...     invoice_ids, ['partner_id', 'amount_total'])
+        >>> sum(invoices.mapped('amount_total'))
+        128500.0
+
+        All the fields are read if `fields` is not specified, except those
+        of a type deferred by the ``deferred_types`` option.
+
+        :return: a :class:`RecordSet <oerplib.service.osv.RecordSet>` instance
+        :raise: :class:`oerplib.error.RPCError`
+        """
+        context = context or self._oerp.context
+        fields = self._get_fields_to_read(fields)
+        size = max(1, self._oerp.config['prefetch_size'])
+        columns = dict((name, []) for name in fields)
+        result_ids = []
+        if ids is None:
+            rows = self.iter_search_read(
+                domain, fields or ['id'], size, order, context)
+        else:
+            rows = self._iter_read(list(ids), fields, size, context)
+        for row in rows:
+            result_ids.append(row['id'])
+            for name in fields:
+                columns[name].append(row.get(name, False))
+        return recordset.RecordSet(self._name, result_ids, columns)
+
+    def _iter_read(self, ids, fields, size, context):
+        """Return a generator of dictionaries of the records `ids` (in the
+        same order), read by chunks of `size` records.
+
+        """
+        for index in xrange(0, len(ids), size):
+            chunk = ids[index:index + size]
+            if not self._oerp.version_info.supports_kwargs:
+                data = self.read(chunk, fields, context)
+            else:
+                data = self.read(chunk, fields, context=context)
+            rows = dict((row['id'], row) for row in data)
+            for id_ in chunk:
+                if id_ not in rows:
+                    raise error.RPCError(
+                        "There is no '{model}' record with ID {obj_id}.".format(
+                            model=self._name, obj_id=id_))
+                yield rows[id_]
+
+    def export(self, domain, fields, path, format='csv', chunk=2000,
+               order='id', context=None):
+        """.. versionadded:: 0.9
+
+        Write the values of `fields` of the records matching the `domain`
+        criteria in the file `path`, and return the number of records
+        exported. Records are fetched by chunks of `chunk` records (see
+        :func:`iter_search_read`) and written as they come, so the memory
+        used stays bounded whatever the number of records.
+
+        >>> oerp.get('account.move.line').export(
+        ...     [('date', '>=', '2014-01-01')],
+        ...     ['name', 'account_id', 'debit', 'credit'],
+        ...     'move_lines.csv')
+        5000000
+
+        Supported formats are ``'csv'``, ``'jsonl'`` (one `JSON` object per
+        line) and ``'parquet'`` (requires the `pyarrow` module, one row group
+        per chunk). The first column is the ID of records, and many2one
+        fields are exported in two columns: the ID of the related record
+        (``account_id``) and its name (``account_id.name``). Empty values
+        are exported as empty strings (`CSV`) or `null` values. All the
+        fields are exported if `fields` is `None`, except those of a type
+        deferred by the ``deferred_types`` option of
+        :attr:`oerplib.OERP.config`.
+
+        :return: the number of records exported
+        :raise: :class:`oerplib.error.RPCError`,
+            :class:`oerplib.error.InternalError` (`pyarrow` not installed)
+        """
+        if format not in export.FORMATS:
+            raise ValueError(
+                "The format '{0}' is not supported (supported formats: "
+                "{1})".format(format, ', '.join(export.FORMATS)))
+        fields = self._get_fields_to_read(fields)
+        columns = self._browse_class.__osv__['columns']
+        for name in fields:
+            if name not in columns:
+                raise ValueError(
+                    "There is no '{0}' field on the '{1}' model".format(
+                        name, self._name))
+        headers = export.get_headers(columns, fields)
+        data = self.iter_search_read(
+            domain, fields or ['id'], chunk, order, context)
+        rows = (export.flatten(columns, fields, row) for row in data)
+        if format == 'csv':
+            return export.write_csv(path, headers, rows)
+        if format == 'jsonl':
+            return export.write_jsonl(path, headers, rows)
+        return export.write_parquet(
+            path, headers, export.get_types(columns, fields), rows, chunk)
+
+    def _get_fields_to_read(self, fields):
+        """Return the list of `fields` to read (without ``id``), or the
+        fields not deferred by the ``deferred_types`` option if `None`.
+
+        """
+        if fields is None:
+            deferred_types = self._oerp.config['deferred_types']
+            fields = sorted(
+                name for name, field
+                in self._browse_class.__osv__['columns'].iteritems()
+                if field.type not in deferred_types
+                and not ('computed' in deferred_types and not field.store))
+        return [name for name in fields if name != 'id']
+
+    def create_many(self, vals_list, chunk=500, context=None, workers=8):
+        """.. versionadded:: 0.9
+
+        Create a record for each dictionary of values of `vals_list`, and
+        return their IDs in the same order.
+
+        >>> oerp.get('res.partner').create_many(
+        ...     [{'name': 'Partner 1'}, {'name': 'Partner 2'}])
+        [42, 43]
+
+        On servers in version `12.0` and above, records are created by chunks
+        of `chunk` records (one ``create`` request per chunk). On previous
+        versions, one ``create`` request per record is sent, with `workers`
+        requests executed concurrently (see
+        :func:`OERP.execute_many <oerplib.OERP.execute_many>`).
+        An error does not interrupt the creation of the other records: the
+        exception is returned in place of the IDs of the records concerned
+        (all the records of its chunk on servers `12.0` and above).
+
+        :return: a list of IDs
+        """
+        context = context or self._oerp.context
+        vals_list = list(vals_list)
+        if not self._oerp.version_info.has_create_multi:
+            calls = (self._get_call('create', [vals], context)
+                     for vals in vals_list)
+            return list(self._oerp.execute_many(calls, workers))
+        chunks = [vals_list[index:index + chunk]
+                  for index in xrange(0, len(vals_list), chunk)]
+        calls = (self._get_call('create', [vals], context) for vals in chunks)
+        result = []
+        for vals, ids in zip(chunks, self._oerp.execute_many(calls, workers)):
+            if isinstance(ids, BaseException):
+                ids = [ids] * len(vals)
+            result.extend(ids)
+        return result
+
+    def write_many(self, values, chunk=500, context=None, workers=8):
+        """.. versionadded:: 0.9
+
+        Update several records with their own values. `values` is a
+        dictionary ``{id: vals}``. Records updated with the same values are
+        grouped in ``write`` requests of `chunk` records at most, `workers`
+        requests being executed concurrently (see
+        :func:`OERP.execute_many <oerplib.OERP.execute_many>`).
+
+        >>> oerp.get('res.partner').write_many(
+        ...     {1: {'active': True}, 2: {'active': True}, 3: {'ref': 'C3'}})
+        {1: True, 2: True, 3: True}
+
+        An error does not interrupt the update of the other records: the
+        exception is returned in place of the result for all the records
+        of its request.
+
+        :return: a dictionary ``{id: result}``
+        """
+        context = context or self._oerp.context
+        # Group the records updated with the same values
+        groups = {}
+        keys = []
+        for id_, vals in values.iteritems():
+            key = repr(sorted(vals.iteritems()))
+            if key not in groups:
+                groups[key] = (vals, [])
+                keys.append(key)
+            groups[key][1].append(id_)
+        chunks = []
+        for key in keys:
+            vals, ids = groups[key]
+            for index in xrange(0, len(ids), chunk):
+                chunks.append((ids[index:index + chunk], vals))
+        calls = (self._get_call('write', [ids, vals], context)
+                 for ids, vals in chunks)
+        result = {}
+        for (ids, vals), res in zip(
+                chunks, self._oerp.execute_many(calls, workers)):
+            for id_ in ids:
+                result[id_] = res
+        return result
+
+    def unlink_many(self, ids, chunk=500, context=None, workers=8):
+        """.. versionadded:: 0.9
+
+        Delete the records `ids` by chunks of `chunk` records, `workers`
+        ``unlink`` requests being executed concurrently (see
+        :func:`OERP.execute_many <oerplib.OERP.execute_many>`), and return
+        the result for each ID in the same order.
+
+        >>> oerp.get('res.partner').unlink_many([42, 43])
+        [True, True]
+
+        An error does not interrupt the deletion of the other records: the
+        exception is returned in place of the result for all the records
+        of its chunk.
+
+        :return: a list of results
+        """
+        context = context or self._oerp.context
+        ids = list(ids)
+        chunks = [ids[index:index + chunk]
+                  for index in xrange(0, len(ids), chunk)]
+        calls = (self._get_call('unlink', [chunk_ids], context)
+                 for chunk_ids in chunks)
+        result = []
+        for chunk_ids, res in zip(
+                chunks, self._oerp.execute_many(calls, workers)):
+            result.extend([res] * len(chunk_ids))
+        return result
+
+    def _get_call(self, method, args, context):
+        """Return a query on the model for the
+        :func:`OERP.execute_many <oerplib.OERP.execute_many>` method.
+
+        """
+        if not self._oerp.version_info.supports_kwargs:
+            return (self._name, method, args + [context])
+        return (self._name, method, args, {'context': context})
+
     def _generate_browse_class(self):
         """Generate a class with all its fields corresponding to
         the model name supplied and return them.
 
         """
         # Retrieve server fields info and generate corresponding local fields
-        fields_get = self._oerp.execute(self._name, 'fields_get')
+        fields_get = self._oerp._get_fields(self._name)
         cls_name = self._name.replace('.', '_')
         # Encode the class name for the Python2 'type()' function.
         # No need to do this for Python3.
@@ -118,17 +469,25 @@ class Model(object):
             field_data = {'type': 'text', 'string': 'Name', 'readonly': True}
             cls_fields['name'] = fields.generate_field(self, 'name', field_data)
 
-        cls = type(cls_name, (browse.BrowseRecord,), {})
+        # Fields are class attributes installed once, records only store
+        # their values
+        cls_dict = {'__slots__': ()}
+        cls_dict.update(cls_fields)
+        cls = type(cls_name, (browse.BrowseRecord,), cls_dict)
         cls.__oerp__ = self._oerp
-        cls.__osv__ = {'name': self._name, 'columns': cls_fields}
-        slots = ['__oerp__', '__osv__', '__dict__', '__data__']
-        slots.extend(cls_fields.keys())
-        cls.__slots__ = slots
+        # Position of values in the storage of records
+        index = {'id': 0}
+        for field_name in sorted(cls_fields):
+            index[field_name] = len(index)
+        cls.__osv__ = {'name': self._name, 'columns': cls_fields,
+                       'index': index, 'model': self}
         return cls
 
-    def _write_record(self, obj, context=None):
-        """Send values of fields updated to the server."""
-        context = context or self._oerp.context
+    def _get_write_vals(self, obj):
+        """Return the values of fields updated of `obj`, as expected by the
+        ``write`` method.
+
+        """
         obj_data = obj.__data__
         vals = {}
         for field_name in obj_data['updated_values']:
@@ -141,8 +500,14 @@ class Model(object):
                 # All other fields
                 else:
                     vals[field_name] = field_value
+        return vals
+
+    def _write_record(self, obj, context=None):
+        """Send values of fields updated to the server."""
+        context = context or self._oerp.context
+        vals = self._get_write_vals(obj)
         try:
-            if v(self._oerp.version) < v('6.1'):
+            if not self._oerp.version_info.supports_kwargs:
                 res = self.write([obj.id], vals, context)
             else:
                 res = self.write([obj.id], vals, context=context)
@@ -150,57 +515,256 @@ class Model(object):
             raise exc
         else:
             # Update raw_data dictionary
-            # FIXME: make it optional to avoid a RPC request?
-            self._refresh(obj, context)
+            self._refresh_written(
+                [obj], context, self._oerp.config['write_refresh'])
             return res
 
+    def _write_records(self, objs, context=None, policy='none'):
+        """Send values of fields updated of several records to the server,
+        with one ``write`` request per set of identical values.
+        Records are then updated according to the refresh `policy`
+        (see :meth:`_refresh_written`).
+        Return the number of requests sent.
+
+        """
+        context = context or self._oerp.context
+        # Values of a record registered several times are merged
+        values = {}
+        ids = []
+        for obj in objs:
+            if obj.id not in values:
+                values[obj.id] = {}
+                ids.append(obj.id)
+            values[obj.id].update(self._get_write_vals(obj))
+        # Group the records updated with the same values
+        groups = {}
+        keys = []
+        for id_ in ids:
+            vals = values[id_]
+            if not vals:
+                continue
+            key = repr(sorted(vals.iteritems()))
+            if key not in groups:
+                groups[key] = (vals, [])
+                keys.append(key)
+            groups[key][1].append(id_)
+        for key in keys:
+            vals, group_ids = groups[key]
+            if not self._oerp.version_info.supports_kwargs:
+                self.write(group_ids, vals, context)
+            else:
+                self.write(group_ids, vals, context=context)
+        requests = len(keys)
+        requests += self._refresh_written(objs, context, policy)
+        return requests
+
+    def _refresh_written(self, objs, context, policy):
+        """Update records once written according to the refresh `policy`:
+
+            - ``'all'``: all fields are read from the server,
+            - ``'written'``: only fields written are read from the server
+              (relational ones being fetched again on the next access),
+            - ``'none'``: values written are applied locally.
+
+        Return the number of requests sent.
+
+        """
+        if policy == 'all':
+            self._refresh_records(objs, context)
+            return 1
+        elif policy == 'written':
+            columns = self._browse_class.__osv__['columns']
+            field_names = set()
+            for obj in objs:
+                obj_data = obj.__data__
+                for field_name in obj_data['updated_values']:
+                    if field_name in obj_data['raw_data'] \
+                            and not getattr(
+                                columns[field_name], 'relation', False):
+                        field_names.add(field_name)
+            rows = {}
+            ids = list(set(obj.id for obj in objs if obj.id))
+            if field_names and ids:
+                if not self._oerp.version_info.supports_kwargs:
+                    data = self.read(ids, list(field_names), context)
+                else:
+                    data = self.read(ids, list(field_names), context=context)
+                for row in data:
+                    rows[row['id']] = row
+            for obj in objs:
+                self._apply_values(obj, rows.get(obj.id, {}))
+            return field_names and ids and 1 or 0
+        for obj in objs:
+            self._apply_values(obj)
+        return 0
+
+    def _apply_values(self, obj, row=None):
+        """Apply locally the values updated of `obj` once written, as if
+        they had been read from the server (values of the `row` dictionary
+        read from the server take precedence). Relational fields are fetched
+        again on the next access.
+
+        """
+        obj_data = obj.__data__
+        columns = self._browse_class.__osv__['columns']
+        row = row or {}
+        for field_name, value in obj_data['updated_values'].iteritems():
+            if field_name not in obj_data['raw_data']:
+                continue
+            if getattr(columns[field_name], 'relation', False):
+                value = None
+            elif field_name in row:
+                value = row[field_name]
+            obj_data['values'][field_name] = value
+            obj_data['raw_data'][field_name] = value
+        obj_data['updated_values'] = browse.NO_UPDATED_VALUES
+
     def _refresh(self, obj, context=None):
         """Retrieve field values from the server.
         May be used to restore the original values
         in the purpose to cancel all changes made.
 
+        """
+        self._refresh_records([obj], context)
+
+    def _refresh_records(self, objs, context=None, fields=None):
+        """Retrieve field values of several records from the server
+        with one request.
+        These records are then prefetched together: relational fields
+        accessed on one of them are fetched for all of them, as well as
+        fields not read now (fields not listed in `fields` if specified,
+        or fields of a type deferred by the ``deferred_types`` option).
+
         """
         context = context or self._oerp.context
-        obj_data = obj.__data__
-        obj_data['context'] = context
-        # Get basic fields (no relational ones)
+        columns = self._browse_class.__osv__['columns']
+        index = self._browse_class.__osv__['index']
+        deferred_types = self._oerp.config['deferred_types']
+        # Get basic fields (no relational or deferred ones)
         basic_fields = []
-        for field_name, field in obj.__osv__['columns'].iteritems():
-            if not getattr(field, 'relation', False):
-                basic_fields.append(field_name)
-            else:
-                obj_data['raw_data'][field_name] = None
-        # Fill fields with values of the record
-        if obj.id:
-            if v(self._oerp.version) < v('6.1'):
-                data = self.read([obj.id], basic_fields, context)
-                if data:
-                    obj_data['raw_data'].update(data[0])
+        lazy_fields = []
+        for field_name, field in columns.iteritems():
+            if getattr(field, 'relation', False):
+                lazy_fields.append(field_name)
+            elif fields is not None:
+                if field_name in fields:
+                    basic_fields.append(field_name)
                 else:
-                    obj_data['raw_data'] = False
+                    lazy_fields.append(field_name)
+            elif field.type in deferred_types \
+                    or ('computed' in deferred_types and not field.store):
+                lazy_fields.append(field_name)
             else:
-                data = self.read([obj.id], basic_fields, context=context)
-                if data:
-                    obj_data['raw_data'].update(data[0])
-                else:
-                    obj_data['raw_data'] = False
-            if obj_data['raw_data'] is False:
-                raise error.RPCError(
-                    "There is no '{model}' record with ID {obj_id}.".format(
-                        model=obj.__class__.__osv__['name'], obj_id=obj.id))
+                basic_fields.append(field_name)
+        # Fill fields with values of the records
+        ids = [obj.id for obj in objs if obj.id]
+        rows = {}
+        if ids and basic_fields:
+            if not self._oerp.version_info.supports_kwargs:
+                data = self.read(ids, basic_fields, context)
+            else:
+                data = self.read(ids, basic_fields, context=context)
+            for row in data:
+                rows[row['id']] = row
         # No ID: fields filled with default values
-        else:
-            if v(self._oerp.version) < v('6.1'):
-                default_get = self.default_get(
-                    obj.__osv__['columns'].keys(), context)
+        default_get = None
+        if len(ids) < len(objs):
+            if not self._oerp.version_info.supports_kwargs:
+                default_get = self.default_get(columns.keys(), context)
+            else:
+                default_get = self.default_get(columns.keys(), context=context)
+        prefetch = {'records': objs, 'fields': {}}
+        for obj in objs:
+            obj_data = obj.__data__
+            obj_data['context'] = context
+            obj_data['prefetch'] = prefetch
+            raw_data = browse.RecordValues(index)
+            obj_data['raw_data'] = raw_data
+            if obj.id:
+                if basic_fields and obj.id not in rows:
+                    raise error.RPCError(
+                        "There is no '{model}' record with ID {obj_id}.".format(
+                            model=obj.__class__.__osv__['name'],
+                            obj_id=obj.id))
+                for field_name in lazy_fields:
+                    raw_data[field_name] = None
+                raw_data.update(rows.get(obj.id, {}))
             else:
-                default_get = self.default_get(
-                    obj.__osv__['columns'].keys(), context=context)
-            obj_data['raw_data'] = {}
-            for field_name in obj.__osv__['columns']:
-                obj_data['raw_data'][field_name] = False
-            obj_data['raw_data'].update(default_get)
-        self._reset(obj)
+                for field_name in columns:
+                    raw_data[field_name] = False
+                raw_data.update(default_get)
+            self._reset(obj)
+
+    def _browse_records(self, ids, context=None, fields=None):
+        """Return a list of browsable records corresponding to `ids`,
+        fetched from the server by chunks (see the ``prefetch_size`` option).
+        Records already browsed with the same context are reused if the
+        ``identity_map`` option is enabled.
+
+        """
+        size = max(1, self._oerp.config['prefetch_size'])
+        if not self._oerp.config['identity_map']:
+            objs = []
+            for index in xrange(0, len(ids), size):
+                chunk = [self._browse_class(id_)
+                         for id_ in ids[index:index + size]]
+                self._refresh_records(chunk, context, fields)
+                objs.extend(chunk)
+            return objs
+        context = context or self._oerp.context
+        identity_map = self._oerp._identity_map
+        context_key = repr(sorted((context or {}).iteritems()))
+        objs = []
+        missing = []
+        created = {}
+        for id_ in ids:
+            obj = None
+            if id_:
+                obj = created.get(id_)
+                if obj is None:
+                    obj = identity_map.get((self._name, id_, context_key))
+            if obj is None:
+                obj = self._browse_class(id_)
+                if id_:
+                    created[id_] = obj
+                missing.append(obj)
+            objs.append(obj)
+        for index in xrange(0, len(missing), size):
+            self._refresh_records(missing[index:index + size], context, fields)
+        # Records registered once fetched only
+        for id_, obj in created.iteritems():
+            identity_map[(self._name, id_, context_key)] = obj
+        return objs
+
+    def _fetch_field(self, obj, field_name):
+        """Retrieve the value of the `field_name` field for `obj` and for all
+        the records prefetched with it which do not have this value yet,
+        with one request.
+
+        """
+        objs = [obj]
+        for rec in obj.__data__['prefetch']['records']:
+            if rec is not obj and rec.id \
+                    and rec.__data__['values'].get(field_name) is None:
+                objs.append(rec)
+        ids = list(set(rec.id for rec in objs))
+        context = obj.__data__['context']
+        if not self._oerp.version_info.supports_kwargs:
+            data = self.read(ids, [field_name], context)
+        else:
+            data = self.read(ids, [field_name], context=context)
+        rows = {}
+        for row in data:
+            rows[row['id']] = row
+        if obj.id not in rows:
+            raise error.RPCError(
+                "There is no '{model}' record with ID {obj_id}.".format(
+                    model=obj.__class__.__osv__['name'], obj_id=obj.id))
+        for rec in objs:
+            if rec.id in rows:
+                value = rows[rec.id][field_name]
+                rec.__data__['values'][field_name] = value
+                rec.__data__['raw_data'][field_name] = value
 
     def _reset(self, obj):
         """Cancel all changes by restoring field values with original values
@@ -209,44 +773,43 @@ class Model(object):
 
         """
         obj_data = obj.__data__
-        obj_data['updated_values'] = {}
-        # Load fields and their values
-        for field in self._browse_class.__osv__['columns'].values():
-            if field.name in obj_data['raw_data']:
-                obj_data['values'][field.name] = \
-                    obj_data['raw_data'][field.name]
-                setattr(obj.__class__, field.name, field)
+        obj_data['updated_values'] = browse.NO_UPDATED_VALUES
+        # Values are those of the last refresh ('raw_data' is not modified)
+        obj_data['values'] = obj_data['raw_data']
 
     def _unlink_record(self, obj, context=None):
         """Delete the object from the server."""
         context = context or self._oerp.context
-        if v(self._oerp.version) < v('6.1'):
+        if not self._oerp.version_info.supports_kwargs:
             return self.unlink([obj.id], context)
         else:
             return self.unlink([obj.id], context=context)
 
     def __getattr__(self, method):
         """Provide a dynamic access to a RPC method."""
+        # Special attributes are not RPC methods
+        if method.startswith('__'):
+            raise AttributeError(method)
         def rpc_method(*args, **kwargs):
             """Return the result of the RPC request."""
-            if v(self._oerp.version) < v('6.1'):
+            if not self._oerp.version_info.supports_kwargs:
                 if kwargs:
                     raise error.RPCError(
                         "Named parameters are not supported by the version "
                         "of this server.")
                 result = self._oerp.execute(
-                    self._browse_class.__osv__['name'], method, *args)
+                    self._name, method, *args)
             else:
                 if self._oerp.config['auto_context'] \
                         and 'context' not in kwargs:
                     kwargs['context'] = self._oerp.context
                 result = self._oerp.execute_kw(
-                    self._browse_class.__osv__['name'], method, args, kwargs)
+                    self._name, method, args, kwargs)
             return result
         return rpc_method
 
     def __repr__(self):
-        return "Model(%r)" % (self._browse_class.__osv__['name'])
+        return "Model(%r)" % (self._name)
 
     # ---------------------------- #
     # -- MutableMapping methods -- #
@@ -260,6 +823,6 @@ class Model(object):
         return browse.BrowseRecordIterator(self, ids)
 
     def __len__(self):
-        return self._oerp.search(self._browse_class.__osv__['name'], count=True)
+        return self._oerp.search(self._name, count=True)
 
 # vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
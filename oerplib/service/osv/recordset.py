@@ -0,0 +1,174 @@
+# -*- coding: UTF-8 -*-
+##############################################################################
+#
+#    OERPLib
+#    Copyright (C) 2013 Sébastien Alix.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""This module provides the RecordSet class."""
+
+from oerplib import error
+
+
+class RecordSet(object):
+    """.. versionadded:: 0.9
+
+    Records of a model whose values are stored column-wise: one list of
+    values per field, plus the list of IDs (:attr:`ids`). No object is
+    created per record, which makes it suitable to process the values of
+    thousands of records.
+
+    .. note::
+        This class have to be used through the
+        :func:`oerplib.service.osv.Model.recordset` method.
+
+    >>> invoices = oerp.get('account.invoice').recordset(
+    ...     domain=[('state', '=', 'open')],
+    ...     fields=['partner_id', 'amount_total'])
+    >>> sum(invoices.mapped('amount_total'))
+    128500.0
+    >>> big = invoices.filtered('amount_total', lambda amount: amount > 1000)
+    >>> for partner, group in big.group_by('partner_id').iteritems():
+    ...     print(partner[1], sum(group.mapped('amount_total')))
+
+    Values are those returned by the ``read`` method (a many2one field
+    is a ``[id, name]`` pair or `False`). Iterating on a record set,
+    or accessing one of its records by its index, returns dictionaries
+    built on the fly.
+    """
+    def __init__(self, model, ids, columns):
+        self.model = model
+        self.ids = ids
+        self._columns = columns
+
+    @property
+    def fields(self):
+        """Names of the fields fetched."""
+        return sorted(self._columns)
+
+    def _get_column(self, field):
+        """Return the list of values of `field`."""
+        if field == 'id':
+            return self.ids
+        if field not in self._columns:
+            raise ValueError(
+                "'{0}' field is not fetched in this record set".format(field))
+        return self._columns[field]
+
+    def _select(self, indexes):
+        """Return a new record set with the records at `indexes`."""
+        ids = self.ids
+        columns = {}
+        for field, values in self._columns.iteritems():
+            columns[field] = [values[index] for index in indexes]
+        return RecordSet(
+            self.model, [ids[index] for index in indexes], columns)
+
+    def mapped(self, field):
+        """Return the list of values of `field` (in the order of records).
+
+        >>> partners.mapped('name')
+        [u'Your Company', u'ASUStek', ...]
+        """
+        return list(self._get_column(field))
+
+    def filtered(self, field, predicate=bool):
+        """Return the records for which `predicate` returns `True` when
+        called with their value of `field` (records with a value set
+        by default).
+
+        >>> partners.filtered('credit_limit', lambda limit: limit > 1000)
+        recordset(res.partner, 12 records)
+        """
+        values = self._get_column(field)
+        return self._select(
+            [index for index, value in enumerate(values) if predicate(value)])
+
+    def sorted(self, key='id', reverse=False):
+        """Return the records sorted by the values of `key`, a field name or
+        a list of field names.
+
+        >>> partners.sorted(['country_id', 'name'], reverse=True)
+        recordset(res.partner, 200 records)
+        """
+        if isinstance(key, basestring):
+            key = [key]
+        columns = [self._get_column(field) for field in key]
+        if len(columns) == 1:
+            values = columns[0]
+        else:
+            values = zip(*columns)
+        indexes = sorted(
+            xrange(len(self.ids)), key=values.__getitem__, reverse=reverse)
+        return self._select(indexes)
+
+    def group_by(self, field):
+        """Return a dictionary ``{value: recordset}`` grouping the records
+        by their value of `field` (many2one values are ``(id, name)``
+        tuples).
+
+        >>> for country, partners in partners.group_by('country_id').items():
+        ...     print(country, len(partners))
+        """
+        groups = {}
+        for index, value in enumerate(self._get_column(field)):
+            if isinstance(value, list):
+                value = tuple(value)
+            groups.setdefault(value, []).append(index)
+        result = {}
+        for value, indexes in groups.iteritems():
+            result[value] = self._select(indexes)
+        return result
+
+    def to_numpy(self, field, dtype=None):
+        """Return the values of `field` as a `NumPy` array (of `dtype` if
+        specified). `False` values are converted to ``0`` for numeric types.
+
+        >>> partners.to_numpy('credit_limit', 'float64').mean()
+        2500.0
+
+        :raise: :class:`oerplib.error.InternalError` (`NumPy` not installed)
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise error.InternalError("'numpy' module not found")
+        return numpy.array(self._get_column(field), dtype=dtype)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        fields = list(self._columns)
+        columns = [self._columns[field] for field in fields]
+        for index, id_ in enumerate(self.ids):
+            row = {'id': id_}
+            for field, values in zip(fields, columns):
+                row[field] = values[index]
+            yield row
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._select(range(len(self.ids))[index])
+        row = {'id': self.ids[index]}
+        for field, values in self._columns.iteritems():
+            row[field] = values[index]
+        return row
+
+    def __repr__(self):
+        return "recordset({0}, {1} records)".format(self.model, len(self.ids))
+
+# vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
@@ -0,0 +1,122 @@
+# -*- coding: UTF-8 -*-
+##############################################################################
+#
+#    OERPLib
+#    Copyright (C) 2013 Sébastien Alix.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""This module provides the UnitOfWork class."""
+
+
+class UnitOfWork(object):
+    """.. versionadded:: 0.9
+
+    Unit of work tracking the browsable records updated while it is in
+    progress, to write them all at once when it ends.
+
+    .. note::
+        This class have to be used through the
+        :func:`oerplib.OERP.session` method.
+
+    Records updated are grouped by model, and records of a model updated
+    with the same values are written with one ``write`` request. Values
+    written are then applied locally (relational fields being fetched again
+    on the next access), or read from the server with one request per model
+    if `refresh` is `True` (all fields) or ``'written'`` (fields written
+    only, see the ``write_refresh`` option of :attr:`oerplib.OERP.config`):
+
+    >>> with oerp.session() as session:
+    ...     for partner in oerp.browse('res.partner', partner_ids):
+    ...         partner.active = False
+    >>> session.requests, session.saved
+    (1, 199)
+
+    Records are written when leaving the ``with`` block, unless an
+    exception is raised inside it (updated values are then kept on the
+    records, and can be canceled with :func:`oerplib.OERP.reset`).
+    """
+    def __init__(self, oerp, refresh=False, context=None):
+        self._oerp = oerp
+        self.refresh = refresh
+        self.context = context
+        self._records = []
+        self._keys = set()
+        self.requests = 0
+        self.saved = 0
+
+    def __enter__(self):
+        self._oerp._uow_stack().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._oerp._uow_stack().remove(self)
+        if exc_type is None:
+            self.flush()
+        return False
+
+    def __len__(self):
+        """Return the number of records to write."""
+        return len(self._records)
+
+    def add(self, record):
+        """Register `record` to write it when the unit of work ends."""
+        if id(record) not in self._keys:
+            self._keys.add(id(record))
+            self._records.append(record)
+
+    def _get_policy(self):
+        """Return the refresh policy corresponding to :attr:`refresh`."""
+        if self.refresh is True:
+            return 'all'
+        return self.refresh or 'none'
+
+    def flush(self):
+        """Write the records registered so far, and update the counters of
+        requests sent (:attr:`requests`) and saved (:attr:`saved`, compared
+        to one :func:`write_record <oerplib.OERP.write_record>` call per
+        record with the same refresh policy).
+        """
+        records = self._records
+        self._records = []
+        self._keys = set()
+        # Group records by model
+        groups = {}
+        keys = []
+        for record in records:
+            model = record.__osv__['model']
+            if id(model) not in groups:
+                groups[id(model)] = (model, [])
+                keys.append(id(model))
+            groups[id(model)][1].append(record)
+        policy = self._get_policy()
+        # 'write_record' sends one request per record ('write'), plus
+        # another one to refresh it ('read') unless the policy is 'none'
+        per_record = policy == 'none' and 1 or 2
+        for index, key in enumerate(keys):
+            model, model_records = groups[key]
+            try:
+                requests = model._write_records(
+                    model_records, self.context, policy)
+            except:
+                # Records not written are kept for the next flush
+                for key_left in keys[index:]:
+                    for record in groups[key_left][1]:
+                        self.add(record)
+                raise
+            self.requests += requests
+            self.saved += per_record * len(model_records) - requests
+
+# vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
@@ -27,6 +27,16 @@ import re
 
 MATCH_VERSION = re.compile(r'[^\d.]')
 
+# Values supported by the 'write_refresh' option
+WRITE_REFRESH_POLICIES = ['all', 'written', 'none']
+
+# Attributes used on the value of the 'cache' option
+RESULT_CACHE_ATTRIBUTES = [
+    'invalidating_methods', 'invalidate', 'get_ttl', 'make_key', 'get', 'set']
+
+# Versions already parsed by the 'v()' function
+_VERSIONS = {}
+
 
 class Config(collections.MutableMapping):
     """Class which manage the configuration of an
@@ -50,9 +60,38 @@ class Config(collections.MutableMapping):
         return self._options[key]
 
     def __setitem__(self, key, value):
-        """Handle ``timeout`` option to set the timeout on the connector."""
+        """Handle ``timeout``, ``pool_size``, ``pool_idle_timeout`` and
+        ``max_connections`` options to configure the connector, check
+        the value of the ``write_refresh`` option, instanciate the
+        result cache if the ``cache`` option is `True` (any false value
+        disabling it), and clear the identity map when the ``identity_map``
+        option changes.
+        """
+        if key == 'write_refresh' and value not in WRITE_REFRESH_POLICIES:
+            raise ValueError(
+                "The value of 'write_refresh' has to be one of {0}".format(
+                    WRITE_REFRESH_POLICIES))
+        if key == 'cache':
+            if value is True:
+                from oerplib.tools.cache import ResultCache
+                value = ResultCache()
+            elif not value:
+                value = None
+            elif [attr for attr in RESULT_CACHE_ATTRIBUTES
+                  if not hasattr(value, attr)]:
+                raise ValueError(
+                    "The value of 'cache' has to be a 'ResultCache' "
+                    "instance, 'True' or 'None'")
+        if key == 'identity_map':
+            self._oerp._identity_map.clear()
         if key == 'timeout':
             self._oerp._connector.timeout = value
+        elif key == 'pool_size':
+            self._oerp._connector.pool.maxsize = value
+        elif key == 'pool_idle_timeout':
+            self._oerp._connector.pool.idle_timeout = value
+        elif key == 'max_connections':
+            self._oerp._connector.pool.maxconn = value
         self._options[key] = value
 
     def __delitem__(self, key):
@@ -131,6 +170,102 @@ def v(version):
 
     :return: the version as tuple
     """
-    return [int(x) for x in clean_version(version).split(".")]
+    info = _VERSIONS.get(version)
+    if info is None:
+        info = tuple(int(x) for x in clean_version(version).split("."))
+        _VERSIONS[version] = info
+    return list(info)
+
+
+class Version(object):
+    """.. versionadded:: 0.9
+
+    Immutable representation of a server version, parsed once with the
+    capabilities of the server it implies:
+
+        >>> from oerplib.tools import Version
+        >>> version = Version('7.0-20131014-231047')
+        >>> version.info
+        (7, 0)
+        >>> version.supports_kwargs, version.has_search_read
+        (True, False)
+        >>> version.xmlrpc_path
+        '/openerp/xmlrpc/1'
+        >>> version >= (6, 1)
+        True
+
+    - ``supports_kwargs``: named parameters and context are supported
+      (``execute_kw``, servers `6.1` and above),
+    - ``has_search_read``: the ``search_read`` method is available on models
+      (servers `8.0` and above),
+    - ``has_render_report``: the ``render_report`` method is available on the
+      ``report`` service (servers `6.1` and above),
+    - ``has_create_multi``: the ``create`` method accepts a list of values
+      to create several records at once (servers `12.0` and above),
+    - ``has_model_modules``: the ``modules`` field of ``ir.model`` binds data
+      models to their modules (servers `6.1` and above),
+    - ``xmlrpc_path``: path of the `XML-RPC` services.
+    """
+    __slots__ = ('string', 'info', 'supports_kwargs', 'has_search_read',
+                 'has_render_report', 'has_create_multi',
+                 'has_model_modules', 'xmlrpc_path')
+
+    def __init__(self, version):
+        info = tuple(v(version))
+        set_ = super(Version, self).__setattr__
+        set_('string', version)
+        set_('info', info)
+        set_('supports_kwargs', info >= (6, 1))
+        set_('has_search_read', info >= (8, 0))
+        set_('has_render_report', info >= (6, 1))
+        set_('has_create_multi', info >= (12, 0))
+        set_('has_model_modules', info >= (6, 1))
+        if info < (6, 1):
+            set_('xmlrpc_path', '/xmlrpc')
+        elif info < (8, 0):
+            set_('xmlrpc_path', '/openerp/xmlrpc/1')
+        else:
+            set_('xmlrpc_path', '/xmlrpc/2')
+
+    def __setattr__(self, name, value):
+        raise AttributeError("'Version' object is immutable")
+
+    def __eq__(self, other):
+        return self.info == self._get_info(other)
+
+    def __ne__(self, other):
+        return self.info != self._get_info(other)
+
+    def __lt__(self, other):
+        return self.info < self._get_info(other)
+
+    def __le__(self, other):
+        return self.info <= self._get_info(other)
+
+    def __gt__(self, other):
+        return self.info > self._get_info(other)
+
+    def __ge__(self, other):
+        return self.info >= self._get_info(other)
+
+    def __hash__(self):
+        return hash(self.info)
+
+    def __str__(self):
+        return self.string
+
+    def __repr__(self):
+        return "Version({0!r})".format(self.string)
+
+    @staticmethod
+    def _get_info(other):
+        """Return the version tuple of `other` (a :class:`Version`,
+        a tuple or a string).
+        """
+        if isinstance(other, Version):
+            return other.info
+        if isinstance(other, basestring):
+            return tuple(v(other))
+        return tuple(other)
 
 # vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
@@ -0,0 +1,439 @@
+# -*- coding: UTF-8 -*-
+##############################################################################
+#
+#    OERPLib
+#    Copyright (C) 2013 Sébastien Alix.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""This module contains the :class:`SchemaCache` class used to persist on
+the disk the schema of a server (version and fields of models), so that
+short-lived processes can start without fetching it again, and the
+:class:`ResultCache` class used to keep in memory the results of idempotent
+RPC methods.
+"""
+import os
+import copy
+import json
+import time
+import atexit
+import weakref
+import hashlib
+import tempfile
+import threading
+
+DEFAULT_PATH = '~/.cache/oerplib'
+
+# Methods whose results are cached by default by 'ResultCache'
+# ('True': default TTL)
+DEFAULT_POLICIES = {
+    'fields_get': True,
+    'name_get': True,
+    'name_search': True,
+    'default_get': True,
+    'context_get': True,
+    'get_object_reference': True,
+    'check_object_reference': True,
+    'xmlid_to_res_id': True,
+}
+
+# Methods invalidating the results cached for their model
+INVALIDATING_METHODS = ['write', 'create', 'unlink']
+
+
+class SchemaCache(object):
+    """Cache of server schemas stored as `JSON` files in the `path`
+    directory (``~/.cache/oerplib`` by default), one file per server.
+
+    For each server, the cache stores the version detected, the URL used
+    and the fields of models (as returned by the ``fields_get`` method) of
+    each database, as well as the context of users logged in with the
+    `lazy` option of :func:`OERP.login <oerplib.OERP.login>`. Data of a
+    database are bound to a `signature` (computed from the list of modules
+    installed), and are discarded as soon as this signature changes.
+
+        >>> from oerplib.tools.cache import SchemaCache
+        >>> cache = SchemaCache()
+        >>> cache.get_version('xmlrpc://localhost:8069')
+        '7.0-20131014-231047'
+
+    The version of a server is no longer returned once it has not been
+    confirmed since `version_ttl` seconds (one day by default). It is also
+    checked again by :func:`OERP.login <oerplib.OERP.login>` (see
+    :class:`OERP <oerplib.OERP>`).
+
+    Fields are written on the disk by batches, at most every `flush_delay`
+    seconds (and when the process exits, or with :func:`flush`). Before
+    writing a file, the data written meanwhile by other processes are read
+    again and merged.
+
+    .. note::
+        This class have to be used through the `schema_cache` parameter of
+        the :class:`OERP <oerplib.OERP>` class.
+    """
+    def __init__(self, path=DEFAULT_PATH, version_ttl=86400, flush_delay=5):
+        self.path = os.path.expanduser(path)
+        self.version_ttl = version_ttl
+        self.flush_delay = flush_delay
+        self._data = {}
+        self._dirty = set()
+        self._last_dump = time.time()
+        self._lock = threading.Lock()
+        # Data not written yet are flushed when the process exits
+        atexit.register(_flush_cache, weakref.ref(self))
+
+    def _get_file(self, server):
+        """Return the path of the file storing the schema of `server`."""
+        name = hashlib.md5(server.encode('utf-8')).hexdigest()
+        return os.path.join(self.path, '{0}.json'.format(name))
+
+    def _read(self, server):
+        """Return the data stored on the disk for `server`."""
+        data = {}
+        try:
+            with open(self._get_file(server)) as file_:
+                data = json.load(file_)
+        except (IOError, ValueError):
+            pass
+        if not isinstance(data, dict) or data.get('server') != server:
+            data = {'server': server, 'databases': {}}
+        return data
+
+    def _load(self, server):
+        """Return the data cached for `server` (read from the disk
+        the first time).
+        """
+        if server not in self._data:
+            self._data[server] = self._read(server)
+        return self._data[server]
+
+    @staticmethod
+    def _merge(data, disk_data):
+        """Complete `data` with the `disk_data` written by other processes
+        for the same version and the same database signatures (`data`
+        having the priority).
+        """
+        if disk_data.get('version') != data.get('version'):
+            return
+        databases = data['databases']
+        for database, disk_db in disk_data.get('databases', {}).iteritems():
+            db_data = databases.get(database)
+            if db_data is None:
+                databases[database] = disk_db
+                continue
+            if db_data.get('signature') != disk_db.get('signature'):
+                continue
+            for lang, models in disk_db.get('fields', {}).iteritems():
+                lang_models = db_data['fields'].setdefault(lang, {})
+                for model, fields in models.iteritems():
+                    lang_models.setdefault(model, fields)
+            for uid, context in disk_db.get('contexts', {}).iteritems():
+                db_data.setdefault('contexts', {}).setdefault(uid, context)
+
+    def _dump(self, server, merge=True):
+        """Write the data cached for `server` on the disk, merged with
+        the data written meanwhile by other processes if `merge` is `True`.
+        The file is replaced atomically to not disturb other processes
+        reading it.
+        """
+        self._dirty.discard(server)
+        self._last_dump = time.time()
+        if merge:
+            self._merge(self._data[server], self._read(server))
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path, 0o700)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as file_:
+                json.dump(self._data[server], file_)
+            os.rename(tmp_path, self._get_file(server))
+        except (IOError, OSError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _dump_later(self, server):
+        """Mark the data of `server` to be written on the disk, and write
+        all pending data if the last writing is older than `flush_delay`.
+        """
+        self._dirty.add(server)
+        if time.time() - self._last_dump >= self.flush_delay:
+            for dirty_server in list(self._dirty):
+                self._dump(dirty_server)
+
+    def flush(self):
+        """Write on the disk the data not written yet."""
+        with self._lock:
+            for server in list(self._dirty):
+                self._dump(server)
+
+    def get_version(self, server):
+        """Return the version cached for `server`, or `None` (also if it
+        has not been confirmed since `version_ttl` seconds).
+        """
+        with self._lock:
+            data = self._load(server)
+            checked = data.get('version_checked') or 0
+            if self.version_ttl is not None \
+                    and time.time() - checked > self.version_ttl:
+                return None
+            return data.get('version')
+
+    def set_version(self, server, version, url=None):
+        """Store (or confirm) the `version` and the `url` of `server`.
+        The cache of databases is cleared if the version changed.
+        """
+        with self._lock:
+            data = self._load(server)
+            if data.get('version') != version:
+                data['databases'] = {}
+            data['version'] = version
+            data['url'] = url
+            data['version_checked'] = time.time()
+            self._dump(server)
+
+    def check_signature(self, server, database, signature):
+        """Bind the cache of `database` to `signature`. Fields previously
+        cached are discarded if the signature changed, in which case
+        `True` is returned.
+        """
+        with self._lock:
+            databases = self._load(server)['databases']
+            db_data = databases.get(database)
+            if db_data is not None and db_data.get('signature') is None:
+                # Contexts cached before the first check are kept
+                db_data['signature'] = signature
+                self._dump(server)
+            elif db_data is None or db_data.get('signature') != signature:
+                databases[database] = {'signature': signature, 'fields': {}}
+                self._dump(server)
+                return db_data is not None
+            return False
+
+    def get_fields(self, server, database, lang, model):
+        """Return the fields of `model` cached for `database`
+        and the language `lang`, or `None`.
+        """
+        with self._lock:
+            db_data = self._load(server)['databases'].get(database)
+            if db_data is None:
+                return None
+            return db_data['fields'].get(lang or '', {}).get(model)
+
+    def set_fields(self, server, database, lang, model, fields):
+        """Store the `fields` of `model` for `database`
+        and the language `lang`.
+        """
+        with self._lock:
+            db_data = self._load(server)['databases'].get(database)
+            if db_data is None:
+                return
+            db_data['fields'].setdefault(lang or '', {})[model] = fields
+            self._dump_later(server)
+
+    def get_context(self, server, database, uid):
+        """Return the context of the user `uid` cached for `database`,
+        or `None`.
+        """
+        with self._lock:
+            db_data = self._load(server)['databases'].get(database)
+            if db_data is None:
+                return None
+            return db_data.get('contexts', {}).get(str(uid))
+
+    def set_context(self, server, database, uid, context):
+        """Store the `context` of the user `uid` for `database`."""
+        with self._lock:
+            databases = self._load(server)['databases']
+            if database not in databases:
+                # Signature not checked yet, cache discarded when it will be
+                databases[database] = {'signature': None, 'fields': {}}
+            db_data = databases[database]
+            db_data.setdefault('contexts', {})[str(uid)] = context
+            self._dump_later(server)
+
+    def clear(self, server, database=None, model=None):
+        """Clear the cache of `server`. Only the fields of `database`
+        (and of `model`) are discarded if specified.
+        """
+        with self._lock:
+            data = self._load(server)
+            if database is None:
+                self._data[server] = {'server': server, 'databases': {}}
+            elif model is None:
+                data['databases'].pop(database, None)
+            elif database in data['databases']:
+                for fields in data['databases'][database]['fields'].values():
+                    fields.pop(model, None)
+            self._dump(server, merge=False)
+
+
+def _flush_cache(cache_ref):
+    """Flush the schema cache referenced by `cache_ref` if it still
+    exists (called when the process exits).
+    """
+    cache = cache_ref()
+    if cache is not None:
+        cache.flush()
+
+
+def _freeze(value):
+    """Return a hashable equivalent of `value` (lists and dictionaries
+    being converted to tuples).
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(val) for val in value)
+    return value
+
+
+class ResultCache(object):
+    """.. versionadded:: 0.9
+
+    Cache of the results of RPC methods, kept in memory for `ttl` seconds
+    (`300` by default). Up to `size` results are stored (`1000` by default),
+    the least recently used ones being evicted first.
+
+    `policies` is a dictionary giving the methods whose results are cached,
+    by name (``'name_get'``) or by model and name
+    (``('res.country', 'read')``), associated to their `TTL` in seconds
+    (or `True` to use the default `ttl`). By default, results of the
+    ``fields_get``, ``name_get``, ``name_search``, ``default_get`` and
+    ``context_get`` methods and of `XML ID` lookups are cached:
+
+        >>> from oerplib.tools.cache import ResultCache, DEFAULT_POLICIES
+        >>> policies = dict(DEFAULT_POLICIES)
+        >>> policies[('res.country', 'read')] = 3600
+        >>> oerp.config['cache'] = ResultCache(size=5000, policies=policies)
+        >>> oerp.get('res.country').read([1], ['name'])  # Sent to the server
+        [{'id': 1, 'name': u'Andorra, Principality of'}]
+        >>> oerp.get('res.country').read([1], ['name'])  # Read from the cache
+        [{'id': 1, 'name': u'Andorra, Principality of'}]
+        >>> oerp.config['cache'].hits, oerp.config['cache'].misses
+        (1, 1)
+
+    Results are cached by model, method and parameters (context included).
+    Results of a model are discarded when one of the
+    :attr:`invalidating_methods` (``write``, ``create`` and ``unlink`` by
+    default) is called on it by the same :class:`OERP <oerplib.OERP>`
+    instance. Changes made by other clients are not detected before the
+    results expire.
+
+    .. note::
+        This class have to be used through the ``cache`` option of
+        :attr:`oerplib.OERP.config`.
+    """
+    def __init__(self, size=1000, ttl=300, policies=None):
+        self.size = size
+        self.ttl = ttl
+        if policies is None:
+            policies = DEFAULT_POLICIES
+        self.policies = dict(policies)
+        self.invalidating_methods = list(INVALIDATING_METHODS)
+        self.hits = 0
+        self.misses = 0
+        # Results by key, in a circular doubly linked list ordered from the
+        # least to the most recently used ([prev, next, key, expires, value])
+        self._entries = {}
+        self._root = []
+        self._root[:] = [self._root, self._root, None, None, None]
+        # Keys of results by model
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(*parts):
+        """Return the key identifying a result. The model has to be
+        the third of `parts` (after the database and the user ID).
+        """
+        return _freeze(parts)
+
+    def get_ttl(self, model, method):
+        """Return the `TTL` of the results of `method` on `model`, or `None`
+        if they are not cached.
+        """
+        policy = self.policies.get((model, method), self.policies.get(method))
+        if policy is True:
+            return self.ttl
+        return policy or None
+
+    def _unlink(self, link):
+        """Remove `link` from the list of results."""
+        prev, next_ = link[0], link[1]
+        prev[1] = next_
+        next_[0] = prev
+
+    def _remove(self, key):
+        """Remove the result identified by `key`."""
+        link = self._entries.pop(key)
+        self._unlink(link)
+        keys = self._models.get(key[2])
+        if keys is not None:
+            keys.discard(key)
+
+    def get(self, key):
+        """Return a ``(found, result)`` tuple for `key`, and update the
+        :attr:`hits` and :attr:`misses` counters.
+        """
+        with self._lock:
+            link = self._entries.get(key)
+            if link is not None and link[3] < time.time():
+                self._remove(key)
+                link = None
+            if link is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            # Move the result to the most recently used end
+            self._unlink(link)
+            last = self._root[0]
+            link[0], link[1] = last, self._root
+            last[1] = self._root[0] = link
+            return True, copy.deepcopy(link[4])
+
+    def set(self, key, result, ttl=None):
+        """Store `result` under `key` for `ttl` seconds (the default
+        TTL if not specified).
+        """
+        expires = time.time() + (ttl or self.ttl)
+        result = copy.deepcopy(result)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while self._entries and len(self._entries) >= self.size:
+                self._remove(self._root[1][2])
+            last = self._root[0]
+            link = [last, self._root, key, expires, result]
+            last[1] = self._root[0] = link
+            self._entries[key] = link
+            self._models.setdefault(key[2], set()).add(key)
+
+    def invalidate(self, model=None):
+        """Discard the results of `model`, or all results if `model`
+        is not specified.
+        """
+        with self._lock:
+            if model is None:
+                self._entries.clear()
+                self._root[:] = [self._root, self._root, None, None, None]
+                self._models.clear()
+                return
+            for key in list(self._models.pop(model, ())):
+                self._remove(key)
+
+# vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
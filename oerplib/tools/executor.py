@@ -0,0 +1,174 @@
+# -*- coding: UTF-8 -*-
+##############################################################################
+#
+#    OERPLib
+#    Copyright (C) 2013 Sébastien Alix.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""This module provides the :class:`Executor` class which runs functions
+in a pool of threads, and the :class:`Future` class representing their
+pending results.
+"""
+import sys
+import threading
+import Queue
+
+from oerplib import error
+
+
+class Future(object):
+    """Result of a function executed asynchronously by an :class:`Executor`.
+
+    >>> future = executor.submit(oerp.search, 'res.partner', [])
+    >>> future.done()
+    False
+    >>> future.result()
+    [1, 2, 3]
+    """
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._result = None
+        self._exc_info = None
+        self._callbacks = []
+
+    def done(self):
+        """Return `True` if the execution is finished."""
+        return self._event.is_set()
+
+    def result(self, timeout=None):
+        """Wait for the end of the execution (at most `timeout` seconds if
+        set) and return its result. The exception raised during the
+        execution (if any) is raised again.
+
+        :raise: :class:`oerplib.error.Error` if the timeout is reached
+        """
+        self._wait(timeout)
+        if self._exc_info:
+            raise self._exc_info[0], self._exc_info[1], self._exc_info[2]
+        return self._result
+
+    def exception(self, timeout=None):
+        """Wait for the end of the execution (at most `timeout` seconds if
+        set) and return the exception raised during the execution,
+        or `None`.
+
+        :raise: :class:`oerplib.error.Error` if the timeout is reached
+        """
+        self._wait(timeout)
+        return self._exc_info and self._exc_info[1] or None
+
+    def add_done_callback(self, func):
+        """Call `func` with the future as argument once the execution
+        is finished (immediately if it is already the case).
+        """
+        with self._lock:
+            if not self.done():
+                self._callbacks.append(func)
+                return
+        func(self)
+
+    def _wait(self, timeout):
+        self._event.wait(timeout)
+        if not self._event.is_set():
+            raise error.Error("Timeout exceeded while waiting for a result")
+
+    def _set_result(self, result, exc_info=None):
+        with self._lock:
+            self._result = result
+            self._exc_info = exc_info
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for func in callbacks:
+            func(self)
+
+
+class Executor(object):
+    """Execute functions in a pool of at most `workers` threads
+    (started on demand).
+
+    >>> from oerplib.tools.executor import Executor
+    >>> executor = Executor(workers=8)
+    >>> future = executor.submit(oerp.search, 'res.partner', [])
+    >>> future.result()
+    [1, 2, 3]
+    >>> executor.shutdown()
+    """
+    def __init__(self, workers=8):
+        if workers < 1:
+            raise ValueError("At least one worker is required")
+        self.workers = workers
+        self._queue = Queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def submit(self, func, *args, **kwargs):
+        """Schedule the execution of ``func(*args, **kwargs)``.
+
+        :return: a :class:`Future` instance
+        """
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise error.InternalError("The executor has been shut down")
+            self._queue.put((future, func, args, kwargs))
+            if len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work)
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+        return future
+
+    def shutdown(self, wait=True, cancel=False):
+        """Stop the threads once all pending executions are finished.
+        If `wait` is `True`, wait for them before returning.
+        If `cancel` is `True`, executions not started yet are canceled
+        (their futures raise an :class:`oerplib.error.InternalError`).
+        """
+        with self._lock:
+            self._shutdown = True
+            threads = self._threads[:]
+            while cancel:
+                try:
+                    item = self._queue.get_nowait()
+                except Queue.Empty:
+                    break
+                try:
+                    raise error.InternalError("The execution has been canceled")
+                except error.InternalError:
+                    item[0]._set_result(None, sys.exc_info())
+            for thread in threads:
+                self._queue.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            future, func, args, kwargs = item
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                future._set_result(None, sys.exc_info())
+            else:
+                future._set_result(result)
+            del item, future
+
+# vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
@@ -19,6 +19,10 @@ _parser.add_argument('--test_netrpc', action='store_true',
                      help="Test the NET-RPC protocol")
 _parser.add_argument('--netrpc_port', default='8070',
                      help="Port to use with the NET-RPC protocol")
+_parser.add_argument('--test_jsonrpc', action='store_true',
+                     help="Test the JSON-RPC protocol")
+_parser.add_argument('--jsonrpc_port', default='8069',
+                     help="Port to use with the JSON-RPC protocol")
 _parser.add_argument('--version', default=None,
                      help="OpenERP version used")
 
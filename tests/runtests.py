@@ -19,6 +19,11 @@ from test_execute_kw import TestExecuteKw
 from test_browse import TestBrowse
 from test_osv import TestOSV
 from test_timeout import TestTimeout
+from test_pool import TestConnectionPool, TestPool
+from test_netrpc import TestNetRPC, TestServiceNetRPC
+from test_jsonrpc import TestServiceJSONRPC
+from test_async import TestAsync
+from test_cache import TestSchemaCache, TestResultCache
 from test_session import TestSession
 from test_inspect import TestInspect
 
@@ -34,6 +39,17 @@ if __name__ == '__main__':
     # 1) Test oerplib.tools
     loader = unittest.TestLoader().loadTestsFromTestCase(TestTools)
     suite.addTest(loader)
+    # Test the pool of connections
+    loader = unittest.TestLoader().loadTestsFromTestCase(TestConnectionPool)
+    suite.addTest(loader)
+    # Test the Net-RPC protocol (local fake server)
+    loader = unittest.TestLoader().loadTestsFromTestCase(TestNetRPC)
+    suite.addTest(loader)
+    loader = unittest.TestLoader().loadTestsFromTestCase(TestServiceNetRPC)
+    suite.addTest(loader)
+    # Test the JSON-RPC services (local fake server)
+    loader = unittest.TestLoader().loadTestsFromTestCase(TestServiceJSONRPC)
+    suite.addTest(loader)
 
     # 2) Test OERP.__init__
     loader = unittest.TestLoader().loadTestsFromTestCase(TestInit)
@@ -74,6 +90,20 @@ if __name__ == '__main__':
     loader = unittest.TestLoader().loadTestsFromTestCase(TestTimeout)
     suite.addTest(loader)
 
+    # Test persistent connections
+    loader = unittest.TestLoader().loadTestsFromTestCase(TestPool)
+    suite.addTest(loader)
+
+    # Test asynchronous requests
+    loader = unittest.TestLoader().loadTestsFromTestCase(TestAsync)
+    suite.addTest(loader)
+
+    # Test schema and result caches
+    loader = unittest.TestLoader().loadTestsFromTestCase(TestSchemaCache)
+    suite.addTest(loader)
+    loader = unittest.TestLoader().loadTestsFromTestCase(TestResultCache)
+    suite.addTest(loader)
+
     # Test session management
     loader = unittest.TestLoader().loadTestsFromTestCase(TestSession)
     suite.addTest(loader)
@@ -104,8 +134,15 @@ if __name__ == '__main__':
         ARGS.protocol = 'netrpc'
         ARGS.port = int(ARGS.netrpc_port)
         unittest.TextTestRunner(verbosity=ARGS.verbosity).run(suite)
-    if not ARGS.test_xmlrpc and not ARGS.test_netrpc:
+    if ARGS.test_jsonrpc:
+        print("-- RUN (JSONRPC) --")
+        ARGS.protocol = 'jsonrpc'
+        ARGS.port = int(ARGS.jsonrpc_port)
+        unittest.TextTestRunner(verbosity=ARGS.verbosity).run(suite)
+    if not ARGS.test_xmlrpc and not ARGS.test_netrpc \
+            and not ARGS.test_jsonrpc:
         print("-- NO TEST --")
-        print("Please use '--test_xmlrpc' and/or '--test_netrpc' option.")
+        print("Please use '--test_xmlrpc', '--test_netrpc' and/or "
+              "'--test_jsonrpc' option.")
 
 # vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
@@ -0,0 +1,85 @@
+# -*- coding: UTF-8 -*-
+
+try:
+    import unittest2 as unittest
+except:
+    import unittest
+
+from args import ARGS
+
+import oerplib
+from oerplib.tools.executor import Future
+
+
+class TestAsync(unittest.TestCase):
+
+    def setUp(self):
+        self.oerp = oerplib.OERP(
+            ARGS.server, protocol=ARGS.protocol, port=ARGS.port,
+            version=ARGS.version)
+        self.user = self.oerp.login(ARGS.user, ARGS.passwd, ARGS.database)
+        self.aoerp = oerplib.AsyncOERP(self.oerp, workers=4)
+
+    def tearDown(self):
+        self.aoerp.shutdown()
+
+    def test_async_execute(self):
+        future = self.aoerp.execute('res.users', 'search', [])
+        self.assertIsInstance(future, Future)
+        self.assertEqual(
+            future.result(), self.oerp.execute('res.users', 'search', []))
+        self.assertTrue(future.done())
+
+    def test_async_read(self):
+        user_ids = self.oerp.search('res.users', [])
+        futures = [self.aoerp.read('res.users', [id_], ['login'])
+                   for id_ in user_ids]
+        results = [future.result()[0]['login'] for future in futures]
+        self.assertEqual(
+            results, [user.login
+                      for user in self.oerp.browse('res.users', user_ids)])
+
+    def test_async_error(self):
+        future = self.aoerp.execute('fake.model', 'search', [])
+        self.assertIsInstance(future.exception(), oerplib.error.RPCError)
+        self.assertRaises(oerplib.error.RPCError, future.result)
+
+    def test_async_callback(self):
+        results = []
+        future = self.aoerp.search('res.users', [])
+        future.add_done_callback(lambda fut: results.append(fut.result()))
+        future.result()
+        self.aoerp.shutdown()
+        self.assertEqual(results, [future.result()])
+
+    def test_execute_many(self):
+        user_ids = self.oerp.search('res.users', [])
+        calls = [('res.users', 'read', [[id_], ['login']]) for id_ in user_ids]
+        calls.append(('fake.model', 'search', [[]]))
+        results = list(self.oerp.execute_many(iter(calls), workers=2))
+        self.assertEqual(len(results), len(calls))
+        for id_, result in zip(user_ids, results):
+            self.assertEqual(result[0]['id'], id_)
+        self.assertIsInstance(results[-1], oerplib.error.RPCError)
+
+    def test_execute_many_unordered(self):
+        user_ids = self.oerp.search('res.users', [])
+        calls = [('res.users', 'read', [[id_], ['login']]) for id_ in user_ids]
+        results = dict(self.oerp.execute_many(calls, ordered=False))
+        self.assertEqual(sorted(results), range(len(calls)))
+        for index, id_ in enumerate(user_ids):
+            self.assertEqual(results[index][0]['id'], id_)
+
+    def test_execute_many_not_logged(self):
+        oerp = oerplib.OERP(
+            ARGS.server, protocol=ARGS.protocol, port=ARGS.port,
+            version=ARGS.version)
+        # Checked when called, not on the first iteration
+        self.assertRaises(
+            oerplib.error.Error, oerp.execute_many, [('res.users', 'search')])
+
+    def test_async_attributes(self):
+        self.assertEqual(self.aoerp.context, self.oerp.context)
+        self.assertIs(self.aoerp.oerp, self.oerp)
+
+# vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
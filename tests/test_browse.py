@@ -5,6 +5,8 @@ try:
 except ImportError:
     import unittest
 import datetime
+import gc
+import weakref
 
 from args import ARGS
 
@@ -45,6 +47,161 @@ class TestBrowse(unittest.TestCase):
             self.assertIsInstance(
                 result, oerplib.service.osv.browse.BrowseRecord)
 
+    def test_browse_with_ids_prefetch(self):
+        user_ids = self.oerp.search('res.users', [])
+        users = [user.login for user in self.oerp.browse('res.users', user_ids)]
+        for size in [1, 2, len(user_ids) + 1]:
+            self.oerp.config['prefetch_size'] = size
+            result = self.oerp.browse('res.users', user_ids)
+            self.assertEqual([user.login for user in result], users)
+
+    def test_browse_with_ids_missing(self):
+        partner_ids = self.oerp.search('res.partner', [], limit=3)
+        ids = partner_ids[:2] + [999999999] + partner_ids[2:]
+        # Records preceding the missing one in its chunk are returned
+        records = []
+        try:
+            for record in self.oerp.browse('res.partner', ids):
+                records.append(record.id)
+        except oerplib.error.RPCError:
+            pass
+        else:
+            self.fail("RPCError not raised")
+        self.assertEqual(records, partner_ids[:2])
+
+    def test_browse_with_ids_relational_prefetch(self):
+        user_ids = self.oerp.search('res.users', [])
+        for user in self.oerp.browse('res.users', user_ids):
+            single = self.oerp.browse('res.users', user.id)
+            self.assertEqual(user.company_id, single.company_id)
+            self.assertEqual(
+                user.company_id.partner_id.name,
+                single.company_id.partner_id.name)
+            self.assertEqual(
+                [group.name for group in user.groups_id],
+                [group.name for group in single.groups_id])
+
+    def test_browse_with_ids_relational_prefetch_error(self):
+        partner_ids = self.oerp.search('res.partner', [])
+        partner = self.oerp.browse('res.partner', partner_ids[0])
+        country_id = partner.country_id and partner.country_id.id
+        category_ids = [category.id for category in partner.category_id]
+        # Targets of the other partners are inaccessible
+        models = []
+        for name, ids in [('res.country', [country_id]),
+                          ('res.partner.category', category_ids)]:
+            model = self.oerp.get(name)
+            model._refresh_records = self._restrict(model, ids)
+            models.append(model)
+        try:
+            partner = iter(self.oerp.browse('res.partner', partner_ids)).next()
+            self.assertEqual(
+                partner.country_id and partner.country_id.id, country_id)
+            self.assertEqual(
+                [category.id for category in partner.category_id],
+                category_ids)
+        finally:
+            for model in models:
+                del model._refresh_records
+
+    @staticmethod
+    def _restrict(model, ids):
+        """Return a '_refresh_records' method of `model` failing to read
+        records other than `ids`.
+        """
+        refresh_records = model._refresh_records
+
+        def wrapper(records, *args, **kwargs):
+            if [record for record in records if record.id not in ids]:
+                raise oerplib.error.RPCError("Access Denied")
+            return refresh_records(records, *args, **kwargs)
+        return wrapper
+
+    def test_browse_with_fields(self):
+        user_ids = self.oerp.search('res.users', [])
+        users = self.oerp.browse('res.users', user_ids, fields=['login'])
+        for user in users:
+            self.assertIsNone(user.__data__['values']['name'])
+            single = self.oerp.browse('res.users', user.id)
+            self.assertEqual(user.login, single.login)
+            self.assertEqual(user.name, single.name)  # Fetched on the fly
+        user = self.oerp.browse('res.users', self.user.id, fields=['login'])
+        self.assertEqual(user.name, self.user.name)
+
+    def test_browse_with_deferred_types(self):
+        self.oerp.config['deferred_types'] = ['char']
+        user = self.oerp.browse('res.users', self.user.id)
+        self.assertIsNone(user.__data__['values']['login'])
+        self.assertEqual(user.login, self.user.login)
+
+    def test_browse_storage(self):
+        user = self.oerp.browse('res.users', self.user.id)
+        self.assertFalse(hasattr(user, '__dict__'))
+        self.assertRaises(AttributeError, setattr, user, 'fake_attr', 1)
+        # Values are not duplicated until they are updated
+        self.assertIs(user.__data__['values'], user.__data__['raw_data'])
+        self.assertEqual(user.__data__['raw_data']['id'], user.id)
+        self.assertEqual(user.__data__['raw_data']['login'], user.login)
+        self.assertFalse(user.__data__['updated_values'])
+        self.assertRaises(
+            TypeError, user.__data__['updated_values'].update, name="Charly")
+        user.name = "Charly"
+        self.assertEqual(user.__data__['updated_values'], {'name': "Charly"})
+        self.assertEqual(user.__data__['raw_data']['name'], self.user.name)
+
+    def test_browse_class_fields(self):
+        user = self.oerp.browse('res.users', self.user.id)
+        cls = type(user)
+        fields = dict(
+            (name, cls.__dict__[name]) for name in cls.__osv__['columns'])
+        # Field descriptors are not replaced when records are refreshed
+        self.oerp.refresh(user)
+        self.oerp.reset(user)
+        for name, field in fields.items():
+            self.assertIs(cls.__dict__[name], field)
+
+    def test_record_methods_requests(self):
+        user = self.oerp.browse('res.users', self.user.id)
+        self.assertIs(user.__osv__['model'], self.oerp.get('res.users'))
+        calls = []
+        for method in ['execute', 'execute_kw']:
+            def wrapper(*args, **kwargs):
+                calls.append(args[:2])
+                return wrapper.method(*args, **kwargs)
+            wrapper.method = getattr(self.oerp, method)
+            setattr(self.oerp, method, wrapper)
+        try:
+            # No request to reset a record (fields are not fetched again)
+            user.name = "Charly"
+            self.oerp.reset(user)
+            self.assertEqual(calls, [])
+            self.assertEqual(user.name, self.user.name)
+            # Only one 'read' request to refresh it
+            self.oerp.refresh(user)
+            self.assertEqual(calls, [('res.users', 'read')])
+        finally:
+            del self.oerp.execute
+            del self.oerp.execute_kw
+
+    def test_browse_identity_map(self):
+        self.assertIsNot(
+            self.oerp.browse('res.users', self.user.id),
+            self.oerp.browse('res.users', self.user.id))
+        self.oerp.config['identity_map'] = True
+        user = self.oerp.browse('res.users', self.user.id)
+        self.assertIs(self.oerp.browse('res.users', self.user.id), user)
+        self.assertIs(
+            list(self.oerp.browse('res.users', [self.user.id]))[0], user)
+        # Records browsed with another context are distinct
+        context = dict(self.oerp.context, fake_key=True)
+        self.assertIsNot(
+            self.oerp.browse('res.users', self.user.id, context), user)
+        # Unused records are not kept
+        user_ref = weakref.ref(user)
+        del user
+        gc.collect()
+        self.assertIsNone(user_ref())
+
     def test_browse_with_id_false(self):
         # Check the result returned
         result = self.oerp.browse('res.users', False)
@@ -91,6 +248,64 @@ class TestBrowse(unittest.TestCase):
         self.oerp.refresh(self.user)
         self.assertEqual(self.user.name, "Administrator")
 
+    def test_session(self):
+        partner_ids = self.oerp.search('res.partner', [], limit=5)
+        partners = list(self.oerp.browse('res.partner', partner_ids))
+        backup = [(partner, partner.name) for partner in partners]
+        with self.oerp.session() as session:
+            for partner in partners:
+                partner.name = "Test session"
+            self.assertEqual(len(session), len(partners))
+        self.assertEqual(session.requests, 1)
+        self.assertEqual(session.saved, len(partners) - 1)
+        for partner in partners:
+            self.assertEqual(partner.name, "Test session")
+            self.assertFalse(partner.__data__['updated_values'])
+        for partner in self.oerp.browse('res.partner', partner_ids):
+            self.assertEqual(partner.name, "Test session")
+        # Restore the original values (one request per name)
+        with self.oerp.session(refresh=True) as session:
+            for partner, name in backup:
+                partner.name = name
+        self.assertEqual(
+            session.requests, len(set(name for _, name in backup)) + 1)
+        for partner, name in backup:
+            self.assertEqual(partner.name, name)
+
+    def test_session_saved(self):
+        partner_ids = self.oerp.search('res.partner', [], limit=5)
+        partners = list(self.oerp.browse('res.partner', partner_ids))
+        backup = [(partner, partner.name) for partner in partners]
+        # Compared to 'write_record' with the same policy: 'write' only
+        # for 'none', 'write' + 'read' for 'written' and 'all'
+        expected = [
+            (False, 1, len(partners) - 1),
+            ('written', 2, 2 * len(partners) - 2),
+            (True, 2, 2 * len(partners) - 2),
+        ]
+        try:
+            for refresh, requests, saved in expected:
+                with self.oerp.session(refresh=refresh) as session:
+                    for partner in partners:
+                        partner.name = "Test session {0}".format(refresh)
+                self.assertEqual(session.requests, requests)
+                self.assertEqual(session.saved, saved)
+        finally:
+            with self.oerp.session() as session:
+                for partner, name in backup:
+                    partner.name = name
+
+    def test_session_with_exception(self):
+        try:
+            with self.oerp.session() as session:
+                self.user.name = "Charly"
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertEqual(session.requests, 0)
+        self.oerp.refresh(self.user)
+        self.assertEqual(self.user.name, "Administrator")
+
     def test_write_record_char(self):
         backup_name = self.user.name
         self.user.name = "Charly"
@@ -100,6 +315,22 @@ class TestBrowse(unittest.TestCase):
         self.oerp.write_record(self.user)
         self.assertEqual(self.user.name, backup_name)
 
+    def test_write_record_refresh(self):
+        backup_name = self.user.name
+        for policy in ['written', 'none', 'all']:
+            self.oerp.config['write_refresh'] = policy
+            self.user.name = "Charly {0}".format(policy)
+            self.oerp.write_record(self.user)
+            self.assertEqual(self.user.name, "Charly {0}".format(policy))
+            self.assertFalse(self.user.__data__['updated_values'])
+            self.assertEqual(
+                self.user.__data__['raw_data']['name'],
+                "Charly {0}".format(policy))
+        self.user.name = backup_name
+        self.oerp.write_record(self.user)
+        self.assertRaises(
+            ValueError, self.oerp.config.__setitem__, 'write_refresh', 'fake')
+
     def test_write_record_boolean(self):
         self.user.active = False
         self.user.active = True
@@ -0,0 +1,198 @@
+# -*- coding: UTF-8 -*-
+
+try:
+    import unittest2 as unittest
+except:
+    import unittest
+import shutil
+import tempfile
+import time
+
+from args import ARGS
+
+import oerplib
+from oerplib.tools.cache import SchemaCache, ResultCache
+
+
+class TestSchemaCache(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.oerp = oerplib.OERP(
+            ARGS.server, protocol=ARGS.protocol, port=ARGS.port,
+            version=ARGS.version, schema_cache=self.path)
+        self.user = self.oerp.login(ARGS.user, ARGS.passwd, ARGS.database)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def _new_oerp(self):
+        self.oerp._schema_cache.flush()
+        oerp = oerplib.OERP(
+            ARGS.server, protocol=ARGS.protocol, port=ARGS.port,
+            schema_cache=self.path)
+        oerp.login(ARGS.user, ARGS.passwd, ARGS.database)
+        # Record the methods called once logged
+        calls = []
+        execute = oerp.execute
+
+        def execute_logged(model, method, *args):
+            calls.append((model, method))
+            return execute(model, method, *args)
+        oerp.execute = execute_logged
+        return oerp, calls
+
+    def test_schema_cache_version(self):
+        oerp = oerplib.OERP(
+            ARGS.server, protocol=ARGS.protocol, port=ARGS.port,
+            schema_cache=self.path)
+        self.assertEqual(oerp.version, self.oerp.version)
+
+    def test_schema_cache_fields(self):
+        fields = self.oerp.get('res.partner')._browse_class.__osv__['columns']
+        oerp, calls = self._new_oerp()
+        model = oerp.get('res.partner')
+        self.assertEqual(
+            sorted(model._browse_class.__osv__['columns']), sorted(fields))
+        self.assertNotIn(('res.partner', 'fields_get'), calls)
+        partner_id = oerp.search('res.partner', [], limit=1)[0]
+        oerp.browse('res.partner', partner_id).name
+
+    def test_schema_cache_context(self):
+        oerp = oerplib.OERP(
+            ARGS.server, protocol=ARGS.protocol, port=ARGS.port,
+            schema_cache=self.path)
+        oerp.login(ARGS.user, ARGS.passwd, ARGS.database, lazy=True)
+        context = oerp.context
+        oerp._schema_cache.flush()
+        # Context of the user read from the cache after a lazy login
+        oerp, calls = self._new_oerp()
+        oerp.login(ARGS.user, ARGS.passwd, ARGS.database, lazy=True)
+        self.assertEqual(oerp.context, context)
+        self.assertNotIn(('res.users', 'context_get'), calls)
+
+    def test_schema_cache_clear(self):
+        self.oerp.get('res.partner')._browse_class
+        self.oerp.clear_models('res.partner')
+        oerp, calls = self._new_oerp()
+        oerp.get('res.partner')._browse_class
+        self.assertIn(('res.partner', 'fields_get'), calls)
+
+    def test_schema_cache_signature(self):
+        self.oerp.get('res.partner')._browse_class
+        self.oerp._schema_cache.check_signature(
+            self.oerp._schema_key, self.oerp.database, 'fake_signature')
+        oerp, calls = self._new_oerp()
+        oerp.get('res.partner')._browse_class
+        self.assertIn(('res.partner', 'fields_get'), calls)
+
+    def test_schema_cache_version_ttl(self):
+        key = self.oerp._schema_key
+        cache = SchemaCache(self.path, version_ttl=0)
+        self.assertEqual(cache.get_version(key), None)
+        cache = SchemaCache(self.path)
+        self.assertEqual(cache.get_version(key), self.oerp.version)
+
+    def test_schema_cache_version_outdated(self):
+        # Server upgraded since its version has been cached
+        SchemaCache(self.path).set_version(self.oerp._schema_key, '5.0')
+        oerp = oerplib.OERP(
+            ARGS.server, protocol=ARGS.protocol, port=ARGS.port,
+            schema_cache=self.path)
+        self.assertEqual(oerp.version, '5.0')
+        oerp.login(ARGS.user, ARGS.passwd, ARGS.database)
+        self.assertEqual(oerp.version, self.oerp.version)
+        self.assertEqual(
+            SchemaCache(self.path).get_version(self.oerp._schema_key),
+            self.oerp.version)
+
+    def test_schema_cache_merge(self):
+        key, database = self.oerp._schema_key, self.oerp.database
+        self.oerp._schema_cache.flush()
+        cache1 = SchemaCache(self.path)
+        cache2 = SchemaCache(self.path)
+        cache1.set_fields(key, database, 'en_US', 'model.a', {'a': {}})
+        cache2.set_fields(key, database, 'en_US', 'model.b', {'b': {}})
+        # Writes are batched...
+        self.assertEqual(
+            SchemaCache(self.path).get_fields(
+                key, database, 'en_US', 'model.a'), None)
+        # ...and merged with the data written by other processes
+        cache1.flush()
+        cache2.flush()
+        cache = SchemaCache(self.path)
+        self.assertEqual(
+            cache.get_fields(key, database, 'en_US', 'model.a'), {'a': {}})
+        self.assertEqual(
+            cache.get_fields(key, database, 'en_US', 'model.b'), {'b': {}})
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.oerp = oerplib.OERP(
+            ARGS.server, protocol=ARGS.protocol, port=ARGS.port,
+            version=ARGS.version)
+        self.user = self.oerp.login(ARGS.user, ARGS.passwd, ARGS.database)
+
+    def test_result_cache_lru(self):
+        cache = ResultCache(size=2)
+        for index in range(3):
+            cache.set(cache.make_key('db', 1, 'res.partner', index), index)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(
+            cache.get(cache.make_key('db', 1, 'res.partner', 0)),
+            (False, None))
+        self.assertEqual(
+            cache.get(cache.make_key('db', 1, 'res.partner', 2)), (True, 2))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.invalidate('res.partner')
+        self.assertEqual(len(cache), 0)
+
+    def test_result_cache_ttl(self):
+        cache = ResultCache(ttl=0.01)
+        key = cache.make_key('db', 1, 'res.partner', 'name_get', [[1]], {})
+        cache.set(key, [[1, 'Partner']])
+        self.assertEqual(cache.get(key), (True, [[1, 'Partner']]))
+        time.sleep(0.02)
+        self.assertEqual(cache.get(key), (False, None))
+
+    def test_result_cache_execute(self):
+        self.oerp.config['cache'] = True
+        cache = self.oerp.config['cache']
+        self.assertIsInstance(cache, ResultCache)
+        model = self.oerp.get('res.users')
+        result = model.name_get([self.user.id])
+        self.assertEqual(model.name_get([self.user.id]), result)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        # Results of the model discarded when one of its records is updated
+        model.write([self.user.id], {'name': self.user.name})
+        model.name_get([self.user.id])
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        # Methods without policy are not cached
+        model.search([])
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_result_cache_disabled(self):
+        self.oerp.config['cache'] = False
+        self.assertIsNone(self.oerp.config['cache'])
+        model = self.oerp.get('res.users')
+        model.name_get([self.user.id])
+        model.write([self.user.id], {'name': self.user.name})
+        self.oerp.clear_models('res.users')
+
+    def test_result_cache_switch_off(self):
+        self.oerp.config['cache'] = True
+        model = self.oerp.get('res.users')
+        model.name_get([self.user.id])
+        self.oerp.config['cache'] = False
+        self.assertIsNone(self.oerp.config['cache'])
+        model.name_get([self.user.id])
+        model.write([self.user.id], {'name': self.user.name})
+
+    def test_result_cache_wrong_value(self):
+        self.assertRaises(
+            ValueError, self.oerp.config.__setitem__, 'cache', 'yes')
+        self.assertIsNone(self.oerp.config['cache'])
+
+# vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
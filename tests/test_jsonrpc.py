@@ -0,0 +1,134 @@
+# -*- coding: UTF-8 -*-
+
+try:
+    import unittest2 as unittest
+except:
+    import unittest
+import BaseHTTPServer
+import SocketServer
+import json
+import socket
+import threading
+import time
+
+from oerplib import rpc
+
+
+class FakeJSONRPCServer(object):
+    """JSON-RPC server answering on a local port with the method called
+    (``/jsonrpc`` route), recording the maximum number of requests
+    processed at the same time. The ``error`` method returns a HTTP 500
+    error, and the ``slow`` method does not answer before `delay` seconds.
+    """
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.getheader('content-length'))
+                params = json.loads(self.rfile.read(length))['params']
+                fake._process(self, params['method'])
+
+            def log_message(self, *args):
+                pass
+
+        class Server(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+            daemon_threads = True
+
+        self._server = Server(('127.0.0.1', 0), Handler)
+        self.port = self._server.server_address[1]
+        thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={'poll_interval': 0.05})
+        thread.daemon = True
+        thread.start()
+
+    def _process(self, handler, method):
+        with self._lock:
+            self.calls.append(method)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            if method == 'slow':
+                time.sleep(self.delay)
+            if method == 'error':
+                handler.send_error(500)
+                return
+            data = json.dumps({'jsonrpc': '2.0', 'result': method})
+            handler.send_response(200)
+            handler.send_header('Content-Type', 'application/json')
+            handler.send_header('Content-Length', str(len(data)))
+            handler.end_headers()
+            handler.wfile.write(data)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class TestServiceJSONRPC(unittest.TestCase):
+
+    def _connector(self, port, timeout=5):
+        return rpc.ConnectorJSONRPC(
+            '127.0.0.1', port, timeout=timeout, version='8.0')
+
+    def test_service_request(self):
+        server = FakeJSONRPCServer()
+        connector = self._connector(server.port)
+        try:
+            self.assertEqual(connector.db.server_version(), 'server_version')
+        finally:
+            server.close()
+
+    def test_service_http_error(self):
+        server = FakeJSONRPCServer()
+        connector = self._connector(server.port)
+        try:
+            self.assertRaises(rpc.error.ConnectorError, connector.db.error)
+            # The connection slot is given back
+            self.assertEqual(connector.pool._in_use, 0)
+        finally:
+            server.close()
+
+    def test_service_connection_refused(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        connector = self._connector(port)
+        self.assertRaises(
+            rpc.error.ConnectorError, connector.db.server_version)
+
+    def test_service_timeout(self):
+        server = FakeJSONRPCServer(delay=0.5)
+        connector = self._connector(server.port, timeout=0.2)
+        try:
+            self.assertRaises(socket.timeout, connector.db.slow)
+        finally:
+            server.close()
+
+    def test_service_max_connections(self):
+        server = FakeJSONRPCServer(delay=0.2)
+        connector = self._connector(server.port)
+        connector.pool.maxconn = 1
+        try:
+            threads = [threading.Thread(target=connector.db.slow)
+                       for index in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(server.calls, ['slow'] * 3)
+            self.assertEqual(server.max_running, 1)
+        finally:
+            server.close()
+
+# vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
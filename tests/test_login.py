@@ -54,4 +54,24 @@ class TestLogin(unittest.TestCase):
         self.assertEqual(oerp.user, user)
         self.assertEqual(oerp.database, ARGS.database)
 
+    def test_oerp_login_lazy(self):
+        # Lazy login: context and user fetched on their first access
+        oerp = oerplib.OERP(
+            ARGS.server, protocol=ARGS.protocol, port=ARGS.port,
+            version=ARGS.version)
+        user_id = oerp.login(ARGS.user, ARGS.passwd, ARGS.database, lazy=True)
+        self.assertIsInstance(user_id, int)
+        self.assertIsNone(oerp._context)
+        self.assertIsNone(oerp._user)
+        # No context required to call methods without 'auto_context'
+        oerp.config['auto_context'] = False
+        model = oerp.get('res.users')
+        model.search([('id', '=', user_id)])
+        self.assertIsNone(oerp._context)
+        self.assertIsInstance(oerp.context, dict)
+        # Models registered meanwhile are kept once the context is known
+        self.assertIs(oerp.get('res.users'), model)
+        self.assertIsInstance(oerp.user, osv.BrowseRecord)
+        self.assertEqual(oerp.user.id, user_id)
+
 # vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
@@ -0,0 +1,164 @@
+# -*- coding: UTF-8 -*-
+
+try:
+    import unittest2 as unittest
+except:
+    import unittest
+import pickle
+import socket
+import threading
+import time
+
+from oerplib import rpc
+from oerplib.rpc import netrpclib
+
+
+class FakeNetRPCServer(object):
+    """Net-RPC server answering on a local port, recording the methods
+    called. The connection is closed after each response if
+    `close_after_response` is `True`, and the ``slow`` method does not
+    answer before `delay` seconds.
+    """
+
+    def __init__(self, close_after_response=False, delay=0.5):
+        self.close_after_response = close_after_response
+        self.delay = delay
+        self.calls = []
+        self.connections = 0
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(('127.0.0.1', 0))
+        self._sock.listen(5)
+        self.port = self._sock.getsockname()[1]
+        thread = threading.Thread(target=self._serve)
+        thread.daemon = True
+        thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, addr = self._sock.accept()
+            except socket.error:
+                return
+            self.connections += 1
+            thread = threading.Thread(target=self._handle, args=(conn,))
+            thread.daemon = True
+            thread.start()
+
+    def _handle(self, conn):
+        sock = netrpclib.NetRPC(conn, timeout=5)
+        try:
+            while True:
+                msg = sock.receive()
+                self.calls.append(msg[1])
+                if msg[1] == 'slow':
+                    time.sleep(self.delay)
+                sock.send(msg[1])
+                if self.close_after_response:
+                    break
+        except (netrpclib.NetRPCError, socket.error):
+            pass
+        sock.close()
+
+    def close(self):
+        self._sock.close()
+
+
+class TestNetRPC(unittest.TestCase):
+
+    def setUp(self):
+        self.client, self.server = socket.socketpair()
+        self.netrpc = netrpclib.NetRPC(self.client, timeout=5)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+
+    def _response(self, result):
+        msg = pickle.dumps([result, None])
+        return '%8d%s%s' % (len(msg), "0", msg)
+
+    def test_netrpc_send(self):
+        self.netrpc.send(('db', 'server_version'))
+        server = netrpclib.NetRPC(self.server)
+        self.assertEqual(server.receive(), ('db', 'server_version'))
+
+    def test_netrpc_receive_by_parts(self):
+        data = self._response({'result': range(1000)})
+
+        def send():
+            for index in xrange(0, len(data), 100):
+                self.server.sendall(data[index:index + 100])
+                time.sleep(0.001)
+        thread = threading.Thread(target=send)
+        thread.start()
+        self.assertEqual(self.netrpc.receive(), {'result': range(1000)})
+        thread.join()
+
+    def test_netrpc_closed_before_response(self):
+        self.server.close()
+        try:
+            self.netrpc.receive()
+        except netrpclib.NetRPCConnectionError as exc:
+            self.assertFalse(exc.response_started)
+        else:
+            self.fail("NetRPCConnectionError not raised")
+
+    def test_netrpc_closed_during_response(self):
+        self.server.sendall(self._response(True)[:12])
+        self.server.close()
+        try:
+            self.netrpc.receive()
+        except netrpclib.NetRPCConnectionError as exc:
+            self.assertTrue(exc.response_started)
+        else:
+            self.fail("NetRPCConnectionError not raised")
+
+
+class TestServiceNetRPC(unittest.TestCase):
+
+    def _connector(self, server, timeout=5):
+        return rpc.ConnectorNetRPC(
+            '127.0.0.1', server.port, timeout=timeout, version='6.0')
+
+    def test_service_reuse_socket(self):
+        server = FakeNetRPCServer()
+        connector = self._connector(server)
+        try:
+            for index in range(3):
+                self.assertEqual(connector.common.fast(), 'fast')
+            self.assertEqual(server.connections, 1)
+        finally:
+            connector.pool.clear()
+            server.close()
+
+    def test_service_stale_socket(self):
+        # The socket reused is closed by the server: the request is sent
+        # again on a new socket, and processed once
+        server = FakeNetRPCServer(close_after_response=True)
+        connector = self._connector(server)
+        try:
+            self.assertEqual(connector.common.first(), 'first')
+            time.sleep(0.1)
+            self.assertEqual(connector.common.second(), 'second')
+            self.assertEqual(server.calls, ['first', 'second'])
+            self.assertEqual(server.connections, 2)
+        finally:
+            connector.pool.clear()
+            server.close()
+
+    def test_service_no_retry_on_timeout(self):
+        server = FakeNetRPCServer(delay=0.5)
+        connector = self._connector(server, timeout=0.2)
+        try:
+            connector.common.fast()
+            start = time.time()
+            self.assertRaises(socket.timeout, connector.common.slow)
+            self.assertLess(time.time() - start, 0.4)
+            time.sleep(0.4)
+            self.assertEqual(server.calls, ['fast', 'slow'])
+        finally:
+            connector.pool.clear()
+            server.close()
+
+# vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
@@ -5,6 +5,13 @@ try:
 except:
     import unittest
 
+import csv
+import json
+import os
+import shutil
+import tempfile
+import threading
+
 from args import ARGS
 
 import oerplib
@@ -22,6 +29,156 @@ class TestOSV(unittest.TestCase):
         # Check the result returned
         self.oerp.get('res.users')
 
+    def test_model_registry(self):
+        # The same proxy is returned while the registry is not invalidated
+        model = self.oerp.get('res.users')
+        self.assertIs(model, self.oerp.get('res.users'))
+        self.oerp.clear_models('res.users')
+        self.assertIsNot(model, self.oerp.get('res.users'))
+        model = self.oerp.get('res.users')
+        self.oerp.clear_models()
+        self.assertIsNot(model, self.oerp.get('res.users'))
+
+    def test_model_registry_threads(self):
+        # The registry can be invalidated while other threads use it
+        errors = []
+
+        def get_models():
+            try:
+                for index in range(200):
+                    self.oerp.get('res.users')
+                    self.oerp.get('res.partner')
+            except Exception as exc:
+                errors.append(exc)
+
+        def clear_models():
+            try:
+                for index in range(200):
+                    self.oerp.clear_models('res.users')
+            except Exception as exc:
+                errors.append(exc)
+        threads = [threading.Thread(target=target)
+                   for target in [get_models, clear_models] * 2]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_model_lazy_fields(self):
+        self.oerp.clear_models('res.users')
+        calls = []
+        execute = self.oerp.execute
+
+        def wrapper(*args, **kwargs):
+            calls.append(args[:2])
+            return execute(*args, **kwargs)
+
+        self.oerp.execute = wrapper
+        try:
+            # Fields are not fetched to call a method of the model
+            model = self.oerp.get('res.users')
+            model.name_get([self.user.id])
+            self.assertNotIn(('res.users', 'fields_get'), calls)
+            # but to browse records
+            model.browse(self.user.id)
+            self.assertIn(('res.users', 'fields_get'), calls)
+        finally:
+            del self.oerp.execute
+
+    def test_model_lazy_fields_error(self):
+        self.oerp.clear_models('res.users')
+        model = self.oerp.get('res.users')
+
+        def generate_browse_class():
+            raise AttributeError('fields_get')
+        model._generate_browse_class = generate_browse_class
+        # Errors raised while generating the browse class are not hidden
+        self.assertRaises(
+            oerplib.error.InternalError, getattr, model, '_browse_class')
+        self.assertRaises(
+            oerplib.error.InternalError, model.browse, self.user.id)
+
+    def test_model_create_write_unlink_many(self):
+        model = self.oerp.get('res.partner')
+        vals_list = [{'name': "Partner {0}".format(i)} for i in range(5)]
+        ids = model.create_many(vals_list, chunk=2)
+        self.assertEqual(len(ids), 5)
+        for id_ in ids:
+            self.assertIsInstance(id_, int)
+        data = model.read(ids, ['name'])
+        names = dict((row['id'], row['name']) for row in data)
+        self.assertEqual(
+            [names[id_] for id_ in ids], [vals['name'] for vals in vals_list])
+        values = dict((id_, {'ref': 'A'}) for id_ in ids[:3])
+        values[ids[3]] = {'ref': 'B'}
+        result = model.write_many(values, chunk=2)
+        self.assertEqual(result, dict((id_, True) for id_ in ids[:4]))
+        data = model.read(ids[:4], ['ref'])
+        refs = dict((row['id'], row['ref']) for row in data)
+        self.assertEqual(
+            [refs[id_] for id_ in ids[:4]], ['A', 'A', 'A', 'B'])
+        self.assertEqual(model.unlink_many(ids, chunk=2), [True] * 5)
+
+    def test_model_create_many_with_errors(self):
+        model = self.oerp.get('res.partner')
+        result = model.create_many([{'name': "Partner"}, {'fake_field': 1}])
+        self.assertIsInstance(result[1], oerplib.error.RPCError)
+        model.unlink([result[0]])
+
+    def test_model_recordset(self):
+        model = self.oerp.get('res.partner')
+        ids = model.search([])[:20]
+        records = model.recordset(ids, ['name', 'credit_limit'])
+        self.assertIsInstance(records, oerplib.service.osv.RecordSet)
+        self.assertEqual(records.ids, ids)
+        self.assertEqual(records.fields, ['credit_limit', 'name'])
+        data = model.read(ids, ['name'])
+        names = dict((row['id'], row['name']) for row in data)
+        self.assertEqual(records.mapped('name'), [names[id_] for id_ in ids])
+        self.assertEqual(records[0]['id'], ids[0])
+        self.assertEqual(len(records[:5]), 5)
+        self.assertEqual(len(list(records)), len(ids))
+        # Filter, sort and group without creating browsable records
+        filtered = records.filtered('id', lambda id_: id_ in ids[:3])
+        self.assertEqual(filtered.ids, ids[:3])
+        self.assertEqual(
+            records.sorted('id', reverse=True).ids, sorted(ids, reverse=True))
+        groups = records.group_by('name')
+        self.assertEqual(sum(len(group) for group in groups.values()), 20)
+        self.assertRaises(ValueError, records.mapped, 'fake_field')
+        # With a domain
+        records = model.recordset(domain=[('id', 'in', ids)], fields=['name'])
+        self.assertEqual(sorted(records.ids), sorted(ids))
+
+    def test_model_export(self):
+        model = self.oerp.get('res.users')
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, 'users.csv')
+            count = model.export(
+                [('id', '=', self.user.id)], ['login', 'partner_id'], path)
+            self.assertEqual(count, 1)
+            with open(path, 'rb') as file_:
+                rows = list(csv.reader(file_))
+            self.assertEqual(
+                rows[0], ['id', 'login', 'partner_id', 'partner_id.name'])
+            self.assertEqual(rows[1][:3], [
+                str(self.user.id), self.user.login,
+                str(self.user.partner_id.id)])
+            path = os.path.join(tmp_dir, 'users.jsonl')
+            count = model.export(
+                [('id', '=', self.user.id)], ['login'], path, format='jsonl')
+            self.assertEqual(count, 1)
+            with open(path) as file_:
+                rows = [json.loads(line) for line in file_]
+            self.assertEqual(
+                rows, [{'id': self.user.id, 'login': self.user.login}])
+            self.assertRaises(
+                ValueError, model.export, [], ['login'], path, format='xls')
+        finally:
+            shutil.rmtree(tmp_dir)
+
     def test_model_method(self):
         # Check the result returned
         model = self.oerp.get('res.users')
@@ -63,5 +220,17 @@ class TestOSV(unittest.TestCase):
             self.assertIsInstance(
                 result, oerplib.service.osv.browse.BrowseRecord)
 
+    def test_model_iter_search_read(self):
+        model = self.oerp.get('res.users')
+        user_ids = self.oerp.search('res.users', [], order='id')
+        for chunk in [1, 2, len(user_ids) + 1]:
+            result = list(model.iter_search_read([], ['login'], chunk=chunk))
+            self.assertEqual([data['id'] for data in result], user_ids)
+            self.assertIn('login', result[0])
+        # Ordered by another field (offset pagination)
+        user_ids = self.oerp.search('res.users', [], order='login')
+        result = list(model.iter_search_read(
+            [], ['login'], chunk=1, order='login'))
+        self.assertEqual([data['id'] for data in result], user_ids)
 
 # vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
@@ -0,0 +1,108 @@
+# -*- coding: UTF-8 -*-
+
+try:
+    import unittest2 as unittest
+except:
+    import unittest
+import time
+import threading
+
+from args import ARGS
+
+import oerplib
+from oerplib.rpc.pool import ConnectionPool
+
+
+class FakeConnection(object):
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def test_pool_acquire_release(self):
+        pool = ConnectionPool(maxsize=1)
+        self.assertIsNone(pool.acquire('key'))
+        self.assertIsNone(pool.acquire('key'))
+        conn1, conn2 = FakeConnection(), FakeConnection()
+        pool.release('key', conn1)
+        pool.release('key', conn2)  # Pool full: closed
+        self.assertTrue(conn2.closed)
+        self.assertIs(pool.acquire('key'), conn1)
+        self.assertIsNone(pool.acquire('key'))
+        self.assertFalse(conn1.closed)
+
+    def test_pool_maxconn(self):
+        pool = ConnectionPool(maxconn=1)
+        pool.acquire('key')
+        released = []
+
+        def release():
+            time.sleep(0.2)
+            released.append(True)
+            pool.release('key', FakeConnection())
+        thread = threading.Thread(target=release)
+        thread.start()
+        # Wait for the connection to be released by the thread
+        self.assertIsNotNone(pool.acquire('key'))
+        self.assertTrue(released)
+        thread.join()
+
+    def test_pool_idle_timeout(self):
+        pool = ConnectionPool(idle_timeout=0.1)
+        conn = FakeConnection()
+        pool.acquire('key')
+        pool.release('key', conn)
+        time.sleep(0.2)
+        self.assertIsNone(pool.acquire('key'))
+        self.assertTrue(conn.closed)
+
+    def test_pool_clear(self):
+        pool = ConnectionPool()
+        conn = FakeConnection()
+        pool.acquire('key')
+        pool.release('key', conn)
+        pool.clear()
+        self.assertTrue(conn.closed)
+        self.assertIsNone(pool.acquire('key'))
+
+
+class TestPool(unittest.TestCase):
+
+    def setUp(self):
+        self.oerp = oerplib.OERP(
+            ARGS.server, protocol=ARGS.protocol, port=ARGS.port,
+            version=ARGS.version)
+        self.user = self.oerp.login(ARGS.user, ARGS.passwd, ARGS.database)
+
+    def test_pool_config(self):
+        self.oerp.config['pool_size'] = 0
+        self.oerp.config['pool_idle_timeout'] = 10
+        self.assertEqual(self.oerp._connector.pool.maxsize, 0)
+        self.assertEqual(self.oerp._connector.pool.idle_timeout, 10)
+        # Requests are still working without persistent connections
+        self.oerp.search('res.users', [])
+        self.oerp.config['pool_size'] = 10
+        for i in range(3):
+            self.oerp.search('res.users', [])
+
+    def test_threads(self):
+        self.oerp.config['max_connections'] = 4
+        user_ids = self.oerp.search('res.users', [])
+        results = []
+
+        def worker():
+            results.append(self.oerp.execute_kw(
+                'res.users', 'search', [[]], {'context': self.oerp.context}))
+        threads = [threading.Thread(target=worker) for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [user_ids] * 16)
+
+# vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4:
@@ -46,4 +46,31 @@ class TestTools(unittest.TestCase):
             else:
                 self.assertFalse(result)
 
+    def test_version(self):
+        version = tools.Version('7.0-20131014-231047')
+        self.assertEqual(version.info, (7, 0))
+        self.assertTrue(version.supports_kwargs)
+        self.assertFalse(version.has_search_read)
+        self.assertEqual(version.xmlrpc_path, '/openerp/xmlrpc/1')
+        self.assertTrue(version >= '6.1')
+        self.assertTrue(version < (8, 0))
+        self.assertRaises(AttributeError, setattr, version, 'info', (8, 0))
+
+    def test_version_flags(self):
+        # [(version, supports_kwargs, has_search_read, xmlrpc_path), ...]
+        versions = [
+            ('6.0', False, False, '/xmlrpc'),
+            ('6.1', True, False, '/openerp/xmlrpc/1'),
+            ('8.0', True, True, '/xmlrpc/2'),
+        ]
+        for version, kwargs, search_read, path in versions:
+            version = tools.Version(version)
+            self.assertEqual(version.supports_kwargs, kwargs)
+            self.assertEqual(version.has_render_report, kwargs)
+            self.assertEqual(version.has_model_modules, kwargs)
+            self.assertEqual(version.has_search_read, search_read)
+            self.assertEqual(version.xmlrpc_path, path)
+            self.assertFalse(version.has_create_multi)
+        self.assertTrue(tools.Version('12.0').has_create_multi)
+
 # vim:expandtab:smartindent:tabstop=4:softtabstop=4:shiftwidth=4: